@@ -0,0 +1,61 @@
+import argparse
+import logging
+import time
+from pathlib import Path
+
+import pymupdf
+
+from borders import BorderSpec, BorderUnit, FourBorders
+from bounds import EXTRACTOR_MAPPING, ExtractorSettings, get_bounds_extractor
+
+TEXT_EXTRACTORS = ["text_page", "dict_text", "text_blocks"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bounds extractors")
+    parser.add_argument("pdfs", type=Path, nargs="+", help="PDF files to extract the bounds of.")
+    parser.add_argument(
+        "-be",
+        "--bounds-extractors",
+        nargs="+",
+        default=TEXT_EXTRACTORS,
+        choices=list(EXTRACTOR_MAPPING.keys()),
+        help="Extractors to compare; the first one is the baseline.",
+    )
+    parser.add_argument("--dpi", type=int, default=None, help="DPI passed to the extractors.")
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per extractor and file; the fastest run is reported.",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    zero = BorderSpec(0, BorderUnit.POINT)
+    borders = FourBorders(zero, zero, zero, zero)
+    for pdf in args.pdfs:
+        doc = pymupdf.open(pdf)
+        print(f"{pdf} ({doc.page_count} pages)")
+        baseline: float | None = None
+        baseline_bounds: list[pymupdf.Rect] | None = None
+        for name in args.bounds_extractors:
+            extractor = get_bounds_extractor(name, borders, ExtractorSettings(show_progress=False))
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                bounds = extractor.get_bounds(doc, args.dpi)
+                best = min(best, time.perf_counter() - start)
+            if baseline is None:
+                baseline, baseline_bounds = best, bounds
+            same = "same bounds" if bounds == baseline_bounds else "different bounds"
+            print(
+                f"  {name:<20} {best:8.3f} s  {best / doc.page_count * 1000:8.2f} ms/page"
+                f"  {baseline / best:6.2f}x  {same}"
+            )
+        doc.close()
+
+
+if __name__ == "__main__":
+    main()
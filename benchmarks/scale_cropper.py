@@ -0,0 +1,105 @@
+import argparse
+import io
+import logging
+import sys
+from pathlib import Path
+
+import pymupdf
+
+from borders import BorderSpec, BorderUnit, FourBorders
+from bounds import EXTRACTOR_MAPPING, ExtractorSettings, get_bounds_extractor
+from crop import get_cropper
+from saving import SAVE_PROFILE_MAPPING, save_document
+
+# Resource objects that pages share and that must be copied once.
+RESOURCE_KINDS = ("fonts", "font files", "images")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the size and the objects of PDFs before and after the scale cropper"
+    )
+    parser.add_argument("pdfs", type=Path, nargs="+", help="PDF files to crop, e.g. font-heavy documents.")
+    parser.add_argument(
+        "-be",
+        "--bounds-extractor",
+        default="bbox",
+        choices=list(EXTRACTOR_MAPPING.keys()),
+        help="Extractor of the bounds the pages are cropped to.",
+    )
+    parser.add_argument(
+        "--save-profiles",
+        nargs="+",
+        default=["fast", "compact"],
+        choices=[name for name, profile in SAVE_PROFILE_MAPPING.items() if not profile.append],
+        help="Save profiles to write the cropped PDFs with.",
+    )
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=None,
+        help=(
+            "Exit with status 1 if an output is larger than this many times its input, "
+            "or if it holds more fonts, font files or images than its input."
+        ),
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    zero = BorderSpec(0, BorderUnit.POINT)
+    borders = FourBorders(zero, zero, zero, zero)
+    extractor = get_bounds_extractor(
+        args.bounds_extractor, borders, ExtractorSettings(show_progress=False)
+    )
+    regressions = 0
+    for pdf in args.pdfs:
+        doc = pymupdf.open(pdf)
+        input_size = pdf.stat().st_size
+        input_counts = count_objects(doc)
+        print(f"{pdf} ({doc.page_count} pages)")
+        print(f"  {'input':<12} {input_size:10d} bytes          {format_counts(input_counts)}")
+        bounds = extractor.get_bounds(doc, None)
+        for profile_name in args.save_profiles:
+            output_doc = get_cropper("scale", doc).crop(bounds)
+            output = io.BytesIO()
+            output_size = save_document(output_doc, output, profile_name)
+            output_counts = count_objects(pymupdf.open(stream=output.getvalue(), filetype="pdf"))
+            ratio = output_size / input_size
+            duplicated = [
+                kind for kind in RESOURCE_KINDS if output_counts[kind] > input_counts[kind]
+            ]
+            print(
+                f"  {profile_name:<12} {output_size:10d} bytes {ratio:6.2f}x  "
+                f"{format_counts(output_counts)}"
+                + (f"  duplicated: {', '.join(duplicated)}" if duplicated else "")
+            )
+            if args.max_ratio is not None and (ratio > args.max_ratio or duplicated):
+                regressions += 1
+        doc.close()
+    if regressions:
+        print(f"{regressions} output(s) exceed the size or resource limits.")
+        sys.exit(1)
+
+
+def count_objects(doc: pymupdf.Document) -> dict[str, int]:
+    """Count all objects of ``doc`` and those of its shared resources."""
+    counts = {"objects": doc.xref_length() - 1, **{kind: 0 for kind in RESOURCE_KINDS}}
+    for xref in range(1, doc.xref_length()):
+        if doc.xref_get_key(xref, "Type") == ("name", "/Font"):
+            counts["fonts"] += 1
+        if doc.xref_get_key(xref, "Subtype") == ("name", "/Image"):
+            counts["images"] += 1
+        if any(
+            doc.xref_get_key(xref, key)[0] == "xref"
+            for key in ("FontFile", "FontFile2", "FontFile3")
+        ):
+            counts["font files"] += 1
+    return counts
+
+
+def format_counts(counts: dict[str, int]) -> str:
+    return ", ".join(f"{count} {kind}" for kind, count in counts.items())
+
+
+if __name__ == "__main__":
+    main()
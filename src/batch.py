@@ -0,0 +1,212 @@
+import argparse
+import dataclasses
+import glob
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from tqdm import tqdm
+
+from main import add_processing_arguments, create_request, positive
+from processing import ProcessPdfRequest, process_pdf
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    input_path: Path
+    pages: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crop PDF Margins of many PDFs")
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="PDF files, directories (searched recursively for PDFs) or glob patterns.",
+    )
+    parser.add_argument(
+        "-m",
+        "--manifest",
+        type=Path,
+        default=None,
+        help="Text file listing one PDF, directory or glob pattern per line.",
+    )
+    parser.add_argument(
+        "-d",
+        "--output-dir",
+        type=Path,
+        required=True,
+        help=(
+            "Directory where the cropped PDFs will be saved to. PDFs found in a directory "
+            "keep their path relative to it."
+        ),
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=positive(int, "Number of jobs"),
+        default=1,
+        help="Number of PDFs processed in parallel (default: 1).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Also process PDFs whose output is newer than the input.",
+    )
+    parser.add_argument(
+        "--summary",
+        type=Path,
+        default=None,
+        help="Optional JSON file the summary (including failures) is written to.",
+    )
+    add_processing_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    patterns = list(args.inputs)
+    if args.manifest is not None:
+        patterns.extend(read_manifest(args.manifest))
+    if not patterns:
+        parser.error("No inputs given; pass PDFs, directories, glob patterns or --manifest.")
+
+    requests: list[ProcessPdfRequest] = []
+    skipped = 0
+    for input_path, output_path in collect_pdfs(patterns, args.output_dir):
+        if not args.force and is_up_to_date(input_path, output_path):
+            skipped += 1
+            continue
+        request = create_request(parser, args, input_path, output_path)
+        requests.append(dataclasses.replace(request, show_progress=False))
+    logging.info("Processing %d PDFs, skipping %d up-to-date ones.", len(requests), skipped)
+
+    start = time.perf_counter()
+    results = run_batch(requests, args.jobs)
+    elapsed = time.perf_counter() - start
+    summary = get_summary(results, skipped, elapsed)
+    log_summary(summary)
+    if args.summary is not None:
+        args.summary.parent.mkdir(parents=True, exist_ok=True)
+        args.summary.write_text(json.dumps(summary, indent=2))
+    if summary["failed"]:
+        raise SystemExit(1)
+
+
+def read_manifest(path: Path) -> list[str]:
+    """Non-empty lines of the manifest, without the ones starting with `#`."""
+    lines = (line.strip() for line in path.read_text().splitlines())
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def collect_pdfs(patterns: list[str], output_dir: Path) -> list[tuple[Path, Path]]:
+    """
+    Expand the inputs to (input PDF, output PDF) pairs in a stable order. Each
+    PDF is processed once, even if several inputs match it.
+    """
+    pairs: dict[Path, tuple[Path, Path]] = {}
+    outputs: dict[Path, Path] = {}
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = [(pdf, output_dir / pdf.relative_to(path)) for pdf in sorted(path.rglob("*.pdf"))]
+        elif path.is_file():
+            matches = [(path, output_dir / path.name)]
+        else:
+            found = sorted(Path(match) for match in glob.glob(pattern, recursive=True))
+            matches = [(pdf, output_dir / pdf.name) for pdf in found if pdf.is_file()]
+            if not matches:
+                logging.warning("No PDFs match %r.", pattern)
+        for input_path, output_path in matches:
+            key = input_path.resolve()
+            if key in pairs:
+                continue
+            if output_path in outputs:
+                logging.warning(
+                    "Skipping %s: its output %s is already written for %s.",
+                    input_path,
+                    output_path,
+                    outputs[output_path],
+                )
+                continue
+            pairs[key] = (input_path, output_path)
+            outputs[output_path] = input_path
+    return list(pairs.values())
+
+
+def is_up_to_date(input_path: Path, output_path: Path) -> bool:
+    return output_path.exists() and output_path.stat().st_mtime >= input_path.stat().st_mtime
+
+
+def run_batch(requests: list[ProcessPdfRequest], jobs: int) -> list[BatchResult]:
+    """Process the PDFs in a pool of ``jobs`` processes; a failing PDF does not stop the others."""
+    results: list[BatchResult] = []
+    with (
+        ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor,
+        tqdm(total=len(requests), unit="pdf") as progress,
+    ):
+        futures = {executor.submit(_process, request): request for request in requests}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # the worker process itself died (e.g. crashed in MuPDF)
+                result = BatchResult(futures[future].input_path, error=f"{type(e).__name__}: {e}")
+            if result.error is not None:
+                logging.error("Failed to process %s: %s", result.input_path, result.error)
+            results.append(result)
+            progress.update()
+    return results
+
+
+def _init_worker() -> None:
+    # Per-page statistics of the extractors would drown the batch progress.
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def _process(request: ProcessPdfRequest) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        pages = process_pdf(request)
+    except Exception as e:
+        return BatchResult(request.input_path, error=f"{type(e).__name__}: {e}")
+    return BatchResult(request.input_path, pages, time.perf_counter() - start)
+
+
+def get_summary(results: list[BatchResult], skipped: int, elapsed: float) -> dict:
+    succeeded = [result for result in results if result.error is None]
+    pages = sum(result.pages for result in succeeded)
+    return {
+        "processed": len(succeeded),
+        "skipped": skipped,
+        "failed": len(results) - len(succeeded),
+        "pages": pages,
+        "seconds": round(elapsed, 3),
+        "pages_per_second": round(pages / elapsed, 2) if elapsed > 0 else 0.0,
+        "failures": [
+            {"input": str(result.input_path), "error": result.error}
+            for result in results
+            if result.error is not None
+        ],
+    }
+
+
+def log_summary(summary: dict):
+    logging.info(
+        "Processed %d PDFs (%d pages) in %.1f s, %.2f pages/s; skipped %d up-to-date, %d failed.",
+        summary["processed"],
+        summary["pages"],
+        summary["seconds"],
+        summary["pages_per_second"],
+        summary["skipped"],
+        summary["failed"],
+    )
+    for failure in summary["failures"]:
+        logging.info("Failed: %s (%s)", failure["input"], failure["error"])
+
+
+if __name__ == "__main__":
+    main()
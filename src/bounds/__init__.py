@@ -1,3 +1,31 @@
-from .factory import EXTRACTOR_MAPPING, get_bounds_extractor
+from .background import BACKGROUND_ESTIMATOR_MAPPING
+from .cache import BoundsCache, CachedBoundsExtractor
+from .dedupe import DeduplicatingBoundsExtractor
+from .factory import EXTRACTOR_MAPPING, get_bounds_extractor, get_keyed_settings
+from .incremental import IncrementalBoundsExtractor
+from .ocr_backends import OCR_BACKEND_MAPPING
+from .parallel import ParallelBoundsExtractor
+from .render_profiles import RENDER_PROFILE_MAPPING
+from .sampled import SampledBoundsExtractor
+from .settings import ExtractorSettings
+from .sidecar import BoundsSidecar, SidecarBoundsExtractor, load_sidecar, save_sidecar
 
-__all__ = ["EXTRACTOR_MAPPING", "get_bounds_extractor"]
+__all__ = [
+    "BACKGROUND_ESTIMATOR_MAPPING",
+    "EXTRACTOR_MAPPING",
+    "OCR_BACKEND_MAPPING",
+    "RENDER_PROFILE_MAPPING",
+    "BoundsCache",
+    "BoundsSidecar",
+    "CachedBoundsExtractor",
+    "DeduplicatingBoundsExtractor",
+    "ExtractorSettings",
+    "IncrementalBoundsExtractor",
+    "ParallelBoundsExtractor",
+    "SampledBoundsExtractor",
+    "SidecarBoundsExtractor",
+    "get_bounds_extractor",
+    "get_keyed_settings",
+    "load_sidecar",
+    "save_sidecar",
+]
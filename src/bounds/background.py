@@ -0,0 +1,106 @@
+import math
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# Approximate number of pixels inspected by the sampled estimator.
+SAMPLE_PIXELS = 16_384
+# A color covering more than half of the sample is necessarily its dominant color.
+MIN_SHARE = 0.5
+
+
+class BackgroundEstimator(ABC):
+    """Estimates the background color of rendered pages of one document."""
+
+    def __init__(self, tolerance: int = 0):
+        self._tolerance = tolerance
+
+    @abstractmethod
+    def estimate(self, pixels: np.ndarray) -> tuple[int, ...]:
+        """Return the background color of a (height, width, channels) pixel array."""
+
+    def reset(self) -> None:
+        """Forget everything learned from previous pages."""
+
+
+class FullCountBackgroundEstimator(BackgroundEstimator):
+    """Counts every pixel of every page."""
+
+    def estimate(self, pixels: np.ndarray) -> tuple[int, ...]:
+        return get_dominant_color(pixels)
+
+
+class SampledBackgroundEstimator(BackgroundEstimator):
+    """
+    Inspects only a strided subset of the pixels. The previous page's
+    background is reused as long as it still covers most of the sample; a full
+    count is done only when neither the prior nor the sample is conclusive.
+    """
+
+    def __init__(self, tolerance: int = 0):
+        super().__init__(tolerance)
+        self._prior: tuple[int, ...] | None = None
+
+    def estimate(self, pixels: np.ndarray) -> tuple[int, ...]:
+        sample = self._sample(pixels)
+        if self._prior is not None and self._share(sample, self._prior) > MIN_SHARE:
+            return self._prior
+
+        candidate = get_dominant_color(sample)
+        if self._share(sample, candidate) <= MIN_SHARE:
+            candidate = get_dominant_color(pixels)
+        self._prior = candidate
+        return candidate
+
+    def reset(self) -> None:
+        self._prior = None
+
+    @staticmethod
+    def _sample(pixels: np.ndarray) -> np.ndarray:
+        height, width = pixels.shape[:2]
+        stride = max(1, math.isqrt(height * width // SAMPLE_PIXELS))
+        return pixels[::stride, ::stride]
+
+    def _share(self, pixels: np.ndarray, color: tuple[int, ...]) -> float:
+        difference = np.abs(pixels.astype(np.int16) - np.asarray(color, dtype=np.int16))
+        matches = np.all(difference <= self._tolerance, axis=2)
+        return float(matches.mean())
+
+
+BACKGROUND_ESTIMATOR_MAPPING: dict[str, type[BackgroundEstimator]] = {
+    "full": FullCountBackgroundEstimator,
+    "sampled": SampledBackgroundEstimator,
+}
+
+
+def get_background_estimator(name: str, tolerance: int = 0) -> BackgroundEstimator:
+    try:
+        cls = BACKGROUND_ESTIMATOR_MAPPING[name]
+    except KeyError:
+        raise ValueError(f"Unknown background estimator: {name!r}")
+    return cls(tolerance)
+
+
+def pack_pixels(pixels: np.ndarray) -> np.ndarray:
+    """Pack up to three 8-bit channels of every pixel into a single uint32."""
+    channels = pixels.shape[2]
+    if channels > 3:
+        raise ValueError(f"Expected at most 3 color channels, got {channels}.")
+    packed = pixels[:, :, 0].astype(np.uint32)
+    for channel in range(1, channels):
+        packed <<= 8
+        packed |= pixels[:, :, channel]
+    return packed
+
+
+def get_dominant_color(pixels: np.ndarray) -> tuple[int, ...]:
+    """Most frequent color of a (height, width, channels) pixel array."""
+    channels = pixels.shape[2]
+    # Count only the colors that occur; a bincount would allocate a bin for every
+    # possible color, 2^24 for RGB, whatever the number of pixels.
+    colors, counts = np.unique(pack_pixels(pixels), return_counts=True)
+    value = int(colors[counts.argmax()])
+    return tuple(
+        (value >> (8 * (channels - 1 - channel))) & 0xFF
+        for channel in range(channels)
+    )
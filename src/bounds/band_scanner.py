@@ -0,0 +1,118 @@
+from collections.abc import Callable
+
+import numpy as np
+import pymupdf
+
+# Renders the given device-pixel rectangle of a page and returns its
+# (height, width) background mask.
+BackgroundRenderer = Callable[[pymupdf.IRect], np.ndarray]
+
+# Lines in the first band of every scan; each following band is twice as thick
+# until the band budget is reached, as most scans stop within a few lines.
+INITIAL_BAND_LINES = 8
+
+
+class BandScanner:
+    """
+    Finds the border cuts and content edges of a page by rendering bands of
+    rows or columns inward from each edge and stopping as soon as the searched
+    line is found. No band covers more than ``band_pixels`` pixels, so peak
+    memory does not depend on the page size.
+
+    Gives the same result as scanning the background mask of the full page,
+    provided that each band renders as it does in a full-page render.
+    """
+
+    def __init__(self, render_background: BackgroundRenderer, band_pixels: int):
+        self._render_background = render_background
+        self._band_pixels = band_pixels
+
+    def scan(
+        self, width: int, height: int
+    ) -> tuple[tuple[int, int, int, int], tuple[int, int, int, int] | None]:
+        """
+        Return the (left, top, right, bottom) border cuts and the content edges
+        of a ``width`` x ``height`` page, or None as edges for empty pages.
+        """
+        first_column = self._find_first_line(True, True, 0, width, 0, height, content=False)
+        left = first_column if first_column is not None else width
+        last_column = self._find_first_line(True, False, left, width, 0, height, content=False)
+        right = width - 1 - last_column if last_column is not None else width - left
+        if left > width - 1 - right:
+            return (left, 0, right, 0), None
+
+        min_col, max_col = left, width - right
+        first_row = self._find_first_line(False, True, 0, height, min_col, max_col, content=False)
+        top = first_row if first_row is not None else height
+        last_row = self._find_first_line(False, False, top, height, min_col, max_col, content=False)
+        bottom = height - 1 - last_row if last_row is not None else height - top
+        cuts = (left, top, right, bottom)
+
+        min_row, max_row = top, height - bottom
+        y0 = self._find_first_line(False, True, min_row, max_row, min_col, max_col, content=True)
+        if y0 is None:
+            return cuts, None
+        y1 = self._find_first_line(False, False, y0, max_row, min_col, max_col, content=True)
+        assert y1 is not None
+        # Rows outside [y0, y1] hold no content, so the column scans can skip them.
+        x0 = self._find_first_line(True, True, min_col, max_col, y0, y1 + 1, content=True)
+        assert x0 is not None
+        x1 = self._find_first_line(True, False, x0, max_col, y0, y1 + 1, content=True)
+        assert x1 is not None
+        return cuts, (x0, y0, x1, y1)
+
+    def _find_first_line(
+        self,
+        vertical: bool,
+        from_start: bool,
+        start: int,
+        stop: int,
+        cross_start: int,
+        cross_stop: int,
+        content: bool,
+    ) -> int | None:
+        """
+        Scan the columns (``vertical``) or rows in [start, stop), restricted to
+        [cross_start, cross_stop) in the other direction, from the start or the
+        end and return the index of the first line containing a content pixel
+        (``content``) or a background pixel.
+        """
+        if start >= stop or cross_start >= cross_stop:
+            return None
+        max_lines = max(1, self._band_pixels // (cross_stop - cross_start))
+        lines = min(INITIAL_BAND_LINES, max_lines)
+        scanned = 0
+        while scanned < stop - start:
+            count = min(lines, stop - start - scanned)
+            if from_start:
+                band_start = start + scanned
+            else:
+                band_start = stop - scanned - count
+            band_stop = band_start + count
+            flags = self._get_line_flags(vertical, band_start, band_stop, cross_start, cross_stop, content)
+            if flags.any():
+                if from_start:
+                    return band_start + int(flags.argmax())
+                return band_stop - 1 - int(flags[::-1].argmax())
+            scanned += count
+            lines = min(lines * 2, max_lines)
+        return None
+
+    def _get_line_flags(
+        self,
+        vertical: bool,
+        band_start: int,
+        band_stop: int,
+        cross_start: int,
+        cross_stop: int,
+        content: bool,
+    ) -> np.ndarray:
+        if vertical:
+            band = pymupdf.IRect(band_start, cross_start, band_stop, cross_stop)
+        else:
+            band = pymupdf.IRect(cross_start, band_start, cross_stop, band_stop)
+        background = self._render_background(band)
+        axis = 0 if vertical else 1
+        if content:
+            return ~background.all(axis=axis)
+        return background.any(axis=axis)
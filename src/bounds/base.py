@@ -1,19 +1,76 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
 
 import pymupdf
 
 from borders import FourBorders
 from .border_adjuster import BorderAdjuster
+from .settings import ExtractorSettings
 
 
 class BoundsExtractor(ABC):
-    def __init__(self, borders: FourBorders):
+    # ExtractorSettings fields that change the bounds of this extractor.
+    keyed_settings: tuple[str, ...] = ()
+
+    def __init__(self, borders: FourBorders, settings: ExtractorSettings = ExtractorSettings()):
         self._border_adjuster = BorderAdjuster(borders)
+        self._settings = settings
+
+    def get_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> list[pymupdf.Rect]:
+        """Bounds of the given page numbers (all pages if None), in that order."""
+        return list(self.iter_bounds(doc, dpi, pages))
+
+    def iter_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect]:
+        """
+        Yield the bounds of the given page numbers (all pages if None) one page
+        at a time, so that they can be consumed while the next page is processed.
+        """
+        page_numbers = self._get_page_numbers(doc, pages)
+        # The raw bounds come first, so that they are iterated to their end.
+        for raw_bounds, page_number in zip(self.iter_raw_bounds(doc, dpi, pages), page_numbers):
+            yield self.adjust_bounds(raw_bounds, doc[page_number].rect)
 
     @abstractmethod
-    def get_bounds(self, doc: pymupdf.Document, dpi: int | None) -> list[pymupdf.Rect]:
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
+        """
+        Like ``iter_bounds``, but yield the content bounds before the borders
+        are added, or None for pages without content.
+        """
         pass
 
+    def adjust_bounds(self, raw_bounds: pymupdf.Rect | None, page_rect: pymupdf.Rect) -> pymupdf.Rect:
+        """Add the borders to raw bounds from ``iter_raw_bounds``."""
+        return self._get_rectangle(
+            bounds=raw_bounds if raw_bounds is not None else pymupdf.Rect(),
+            has_content=raw_bounds is not None,
+            page_rect=page_rect,
+        )
+
+    @staticmethod
+    def _get_page_numbers(doc: pymupdf.Document, pages: Sequence[int] | None) -> Sequence[int]:
+        return range(doc.page_count) if pages is None else pages
+
+    def _iter_doc_pages(
+        self, doc: pymupdf.Document, pages: Sequence[int] | None
+    ) -> Iterator[pymupdf.Page]:
+        for page_number in self._get_page_numbers(doc, pages):
+            yield doc.load_page(page_number)
+
     def _get_rectangle(
         self,
         bounds: pymupdf.Rect,
@@ -27,6 +84,37 @@ class BoundsExtractor(ABC):
             return pymupdf.Rect(0, 0, page_rect.width, page_rect.height)
 
 
+class ExtractionRun:
+    """
+    Raw bounds of ``pages`` from one run of ``extractor``, taken one at a time
+    with ``next()`` by an extractor that wraps it. Used as a context manager,
+    it runs the extractor to its end on exit, because extractors log their
+    summary only after their last page.
+    """
+
+    def __init__(
+        self,
+        extractor: BoundsExtractor,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int],
+    ):
+        self._bounds = extractor.iter_raw_bounds(doc, dpi, pages) if pages else iter(())
+
+    def __enter__(self) -> "ExtractionRun":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            next(self._bounds, None)
+
+    def __iter__(self) -> Iterator[pymupdf.Rect | None]:
+        return self
+
+    def __next__(self) -> pymupdf.Rect | None:
+        return next(self._bounds)
+
+
 # def process_pdf(filename: str):
 #     doc = fitz.open(file_name)  # open document
 
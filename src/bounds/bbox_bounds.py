@@ -0,0 +1,136 @@
+from collections.abc import Iterator, Sequence
+from typing import override
+
+import pymupdf
+from pymupdf import mupdf
+
+from .base import BoundsExtractor
+
+
+class BBoxDevice(mupdf.FzDevice2):
+    """
+    MuPDF device that collects the union of the areas painted on the page:
+    filled and stroked paths, text, images and shadings, each limited to the
+    clip in effect. Invisible text, fully transparent paint, the contents of
+    soft masks and paint covering the whole page (backgrounds and frames) are
+    skipped.
+    """
+
+    def __init__(self, page_rect: pymupdf.Rect):
+        super().__init__()
+        self.bounds = pymupdf.Rect()
+        self._page_rect = page_rect
+        self._clips: list[pymupdf.Rect] = [page_rect]
+        # Nesting depth of soft mask definitions, which are never painted themselves.
+        self._mask_depth = 0
+        # Areas of the soft masks being defined, applied as clips once defined.
+        self._mask_areas: list[pymupdf.Rect] = []
+        self.use_virtual_fill_path()
+        self.use_virtual_stroke_path()
+        self.use_virtual_clip_path()
+        self.use_virtual_clip_stroke_path()
+        self.use_virtual_fill_text()
+        self.use_virtual_stroke_text()
+        self.use_virtual_clip_text()
+        self.use_virtual_clip_stroke_text()
+        self.use_virtual_fill_shade()
+        self.use_virtual_fill_image()
+        self.use_virtual_fill_image_mask()
+        self.use_virtual_clip_image_mask()
+        self.use_virtual_pop_clip()
+        self.use_virtual_begin_mask()
+        self.use_virtual_end_mask()
+
+    def fill_path(self, ctx, path, even_odd, ctm, colorspace, color, alpha, color_params):
+        self._paint(mupdf.ll_fz_bound_path(path, None, ctm), alpha)
+
+    def stroke_path(self, ctx, path, stroke, ctm, colorspace, color, alpha, color_params):
+        self._paint(mupdf.ll_fz_bound_path(path, stroke, ctm), alpha)
+
+    def fill_text(self, ctx, text, ctm, colorspace, color, alpha, color_params):
+        self._paint(mupdf.ll_fz_bound_text(text, None, ctm), alpha)
+
+    def stroke_text(self, ctx, text, stroke, ctm, colorspace, color, alpha, color_params):
+        self._paint(mupdf.ll_fz_bound_text(text, stroke, ctm), alpha)
+
+    def fill_shade(self, ctx, shade, ctm, alpha, color_params):
+        self._paint(mupdf.ll_fz_bound_shade(shade, ctm), alpha)
+
+    def fill_image(self, ctx, image, ctm, alpha, color_params):
+        self._paint(mupdf.ll_fz_transform_rect(mupdf.fz_unit_rect, ctm), alpha)
+
+    def fill_image_mask(self, ctx, image, ctm, colorspace, color, alpha, color_params):
+        self._paint(mupdf.ll_fz_transform_rect(mupdf.fz_unit_rect, ctm), alpha)
+
+    def clip_path(self, ctx, path, even_odd, ctm, scissor):
+        self._push_clip(mupdf.ll_fz_bound_path(path, None, ctm))
+
+    def clip_stroke_path(self, ctx, path, stroke, ctm, scissor):
+        self._push_clip(mupdf.ll_fz_bound_path(path, stroke, ctm))
+
+    def clip_text(self, ctx, text, ctm, scissor):
+        self._push_clip(mupdf.ll_fz_bound_text(text, None, ctm))
+
+    def clip_stroke_text(self, ctx, text, stroke, ctm, scissor):
+        self._push_clip(mupdf.ll_fz_bound_text(text, stroke, ctm))
+
+    def clip_image_mask(self, ctx, image, ctm, scissor):
+        self._push_clip(mupdf.ll_fz_transform_rect(mupdf.fz_unit_rect, ctm))
+
+    def pop_clip(self, ctx):
+        if len(self._clips) > 1:
+            self._clips.pop()
+
+    def begin_mask(self, ctx, area, luminosity, colorspace, bc, color_params):
+        self._mask_depth += 1
+        self._mask_areas.append(self._to_rect(area))
+
+    def end_mask(self, ctx, transfer_function):
+        # The mask now clips everything painted until the matching pop_clip.
+        self._mask_depth -= 1
+        self._clips.append(self._mask_areas.pop() & self._clips[-1])
+
+    def _push_clip(self, rect) -> None:
+        self._clips.append(self._to_rect(rect) & self._clips[-1])
+
+    def _paint(self, rect, alpha: float) -> None:
+        if self._mask_depth or alpha <= 0:
+            return
+        painted = self._to_rect(rect) & self._clips[-1]
+        if painted.is_empty or painted.contains(self._page_rect):
+            # nothing visible, or a page background or frame
+            return
+        self.bounds |= painted
+
+    @staticmethod
+    def _to_rect(rect) -> pymupdf.Rect:
+        return pymupdf.Rect(rect.x0, rect.y0, rect.x1, rect.y1)
+
+
+class BBoxBoundsExtractor(BoundsExtractor):
+    """
+    Runs each page's content through a bounding-box device once, so text,
+    images and vector graphics are all covered without rendering the page.
+    """
+
+    @override
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
+        _ = dpi
+        for page in self._iter_doc_pages(doc, pages):
+            bounds = self._get_painted_bounds(page)
+            yield bounds if not bounds.is_empty else None
+
+    @staticmethod
+    def _get_painted_bounds(page: pymupdf.Page) -> pymupdf.Rect:
+        # Like the text extractors, work in the coordinates of the unrotated page.
+        derotation = page.derotation_matrix
+        device = BBoxDevice(page.rect * derotation)
+        fz_page = page.this if isinstance(page.this, mupdf.FzPage) else mupdf.FzPage(page.this)
+        mupdf.fz_run_page(fz_page, device, mupdf.FzMatrix(*derotation), mupdf.FzCookie())
+        mupdf.fz_close_device(device)
+        return device.bounds
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import time
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import override
+
+import pymupdf
+
+from borders import FourBorders
+from .base import BoundsExtractor, ExtractionRun
+from .digest import get_page_digests
+from .factory import get_keyed_settings
+from .settings import ExtractorSettings
+
+# Bumped whenever extractors change in a way that changes their bounds.
+CACHE_VERSION = 1
+# Default size of the cache database, in bytes.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Share of the least recently used entries removed per eviction round.
+EVICTION_FRACTION = 0.1
+
+
+class BoundsCache:
+    """
+    SQLite database of raw page bounds (before the borders are added) keyed by
+    a page digest and a digest of the extractor configuration. Empty pages are
+    stored too. The least recently used entries are evicted once the database
+    holds more than ``max_bytes``.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        # Batch processes may share the cache, so wait for each other's writes.
+        self._connection = sqlite3.connect(path, timeout=60)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS bounds ("
+            "config TEXT NOT NULL, page TEXT NOT NULL, "
+            "x0 REAL, y0 REAL, x1 REAL, y1 REAL, used REAL NOT NULL, "
+            "PRIMARY KEY (config, page))"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS bounds_used ON bounds (used)")
+        self._connection.commit()
+
+    def get_many(self, config: str, pages: Sequence[str]) -> dict[str, pymupdf.Rect | None]:
+        """Cached bounds of those ``pages`` that are in the cache (None for empty pages)."""
+        found: dict[str, pymupdf.Rect | None] = {}
+        unique = list(dict.fromkeys(pages))
+        # Stay below SQLite's limit of host parameters per statement.
+        for start in range(0, len(unique), 500):
+            batch = unique[start : start + 500]
+            rows = self._connection.execute(
+                f"SELECT page, x0, y0, x1, y1 FROM bounds WHERE config = ? "
+                f"AND page IN ({', '.join('?' * len(batch))})",
+                [config, *batch],
+            )
+            for page, x0, y0, x1, y1 in rows:
+                found[page] = pymupdf.Rect(x0, y0, x1, y1) if x0 is not None else None
+        if found:
+            self._connection.executemany(
+                "UPDATE bounds SET used = ? WHERE config = ? AND page = ?",
+                [(time.time(), config, page) for page in found],
+            )
+            self._connection.commit()
+        return found
+
+    def put(self, config: str, page: str, bounds: pymupdf.Rect | None) -> None:
+        coordinates = tuple(bounds) if bounds is not None else (None,) * 4
+        self._connection.execute(
+            "INSERT OR REPLACE INTO bounds VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (config, page, *coordinates, time.time()),
+        )
+        self._connection.commit()
+
+    def evict(self) -> int:
+        """Remove the least recently used entries until the cache fits; return how many."""
+        evicted = 0
+        while self._get_used_bytes() > self._max_bytes:
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM bounds").fetchone()
+            if count == 0:
+                break
+            removed = self._connection.execute(
+                "DELETE FROM bounds WHERE rowid IN "
+                "(SELECT rowid FROM bounds ORDER BY used LIMIT ?)",
+                (max(1, math.ceil(count * EVICTION_FRACTION)),),
+            ).rowcount
+            self._connection.commit()
+            evicted += removed
+        return evicted
+
+    def close(self) -> None:
+        evicted = self.evict()
+        if evicted:
+            logging.info("Evicted %d entries from the bounds cache.", evicted)
+        self._connection.close()
+
+    def _get_used_bytes(self) -> int:
+        (page_size,) = self._connection.execute("PRAGMA page_size").fetchone()
+        (page_count,) = self._connection.execute("PRAGMA page_count").fetchone()
+        (free_pages,) = self._connection.execute("PRAGMA freelist_count").fetchone()
+        return (page_count - free_pages) * page_size
+
+
+class CachedBoundsExtractor(BoundsExtractor):
+    """
+    Looks the raw bounds of each page up in a ``BoundsCache`` and runs the
+    wrapped extractor only on the pages that are not cached yet. The borders
+    are added afterwards, so changing them never invalidates the cache.
+    """
+
+    def __init__(
+        self,
+        extractor: BoundsExtractor,
+        extractor_name: str,
+        cache: BoundsCache,
+        borders: FourBorders,
+        settings: ExtractorSettings = ExtractorSettings(),
+    ):
+        super().__init__(borders, settings)
+        self._extractor = extractor
+        self._extractor_name = extractor_name
+        self._cache = cache
+
+    @override
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
+        page_numbers = list(self._get_page_numbers(doc, pages))
+        digests = get_page_digests(doc, page_numbers)
+        config = self._get_config_digest(dpi)
+        cached = self._cache.get_many(config, digests)
+        missing = [n for n, digest in zip(page_numbers, digests) if digest not in cached]
+        logging.info(
+            "Bounds cache: %d of %d pages cached.",
+            len(page_numbers) - len(missing),
+            len(page_numbers),
+        )
+
+        with ExtractionRun(self._extractor, doc, dpi, missing) as extracted:
+            for digest in digests:
+                if digest in cached:
+                    yield cached[digest]
+                    continue
+                bounds = next(extracted)
+                self._cache.put(config, digest, bounds)
+                yield bounds
+
+    def _get_config_digest(self, dpi: int | None) -> str:
+        config = {
+            "version": CACHE_VERSION,
+            "extractor": self._extractor_name,
+            "dpi": dpi,
+            "settings": get_keyed_settings(self._extractor_name, self._settings),
+        }
+        return hashlib.blake2b(json.dumps(config, sort_keys=True).encode(), digest_size=16).hexdigest()
@@ -0,0 +1,113 @@
+from collections.abc import Iterator, Sequence
+from typing import override
+
+import numpy as np
+import pymupdf
+from scipy import ndimage
+
+from .raster import RasterBoundsExtractor
+
+# DPI used when no DPI is requested; text-sized components need a few pixels.
+DEFAULT_DPI = 150
+# Channel difference from the background color above which a pixel is ink.
+INK_THRESHOLD = 64
+# Components smaller than this in both directions are specks, in PDF points.
+MIN_COMPONENT_SIZE = 2.0
+# Components taller than this are not text (figures, frames, shadows), in PDF points.
+MAX_COMPONENT_HEIGHT = 72.0
+# Components longer than this many times their thickness are rules or edge shadows.
+MAX_ASPECT_RATIO = 25.0
+# Components filling more of their box than this are solid blobs (e.g. punch
+# holes) once both of their sides exceed MAX_STROKE_WIDTH points.
+MAX_FILL_RATIO = 0.75
+MAX_STROKE_WIDTH = 6.0
+
+# 8-connectivity, so diagonal strokes of a glyph stay one component.
+CONNECTIVITY = np.ones((3, 3), dtype=bool)
+
+
+class ComponentBoundsExtractor(RasterBoundsExtractor):
+    """
+    Binarizes the rendered page, labels its connected components and returns
+    the union of the components whose size and fill look like text. Scanner
+    specks, punch holes, rules and page-edge shadows are ignored, like with
+    OCR, but without running an OCR engine.
+    """
+
+    @override
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
+        for page in self._iter_pages(doc, pages):
+            page_dpi = self._get_page_dpi(page, dpi if dpi is not None else DEFAULT_DPI)
+            yield self._get_text_box(page, page_dpi)
+
+    def _get_text_box(self, page: pymupdf.Page, dpi: int) -> pymupdf.Rect | None:
+        """Union of the text-like components in PDF points, or None if there are none."""
+        pix = self._render_page(page, dpi)
+        pixels = self._pixmap_to_array(pix)
+        color = self._background_estimator.estimate(pixels)
+        tolerance = max(self._render_profile.background_tolerance, INK_THRESHOLD)
+        background = self._get_background_mask(pixels, (pix.width, pix.height), color, tolerance)
+        del pixels, pix
+
+        # Uniform border lines (scanner frames) are cut away before labeling.
+        height, width = background.shape
+        left_cut, top_cut, right_cut, bottom_cut = self._get_mask_border_cuts(background)
+        ink = ~background[top_cut : height - bottom_cut, left_cut : width - right_cut]
+        labels, count = ndimage.label(ink, structure=CONNECTIVITY)
+        if count == 0:
+            return None
+
+        slices = ndimage.find_objects(labels)
+        boxes = np.array(
+            [(rows.start, cols.start, rows.stop, cols.stop) for rows, cols in slices],
+            dtype=np.int64,
+        )
+        areas = np.bincount(labels.ravel(), minlength=count + 1)[1:]
+        scale_factor = self._get_scale_factor(dpi)
+        keep = self._get_text_like(boxes, areas, ink.shape, scale_factor)
+        if not keep.any():
+            return None
+
+        y0, x0 = boxes[keep, :2].min(axis=0)
+        y1, x1 = boxes[keep, 2:].max(axis=0)
+        return pymupdf.Rect(
+            (left_cut + x0) * scale_factor,
+            (top_cut + y0) * scale_factor,
+            (left_cut + x1) * scale_factor,
+            (top_cut + y1) * scale_factor,
+        )
+
+    @staticmethod
+    def _get_text_like(
+        boxes: np.ndarray,
+        areas: np.ndarray,
+        shape: tuple[int, ...],
+        scale_factor: float,
+    ) -> np.ndarray:
+        """
+        Boolean mask of the components, given as (y0, x0, y1, x1) pixel boxes
+        and pixel counts, whose size, shape and fill look like text.
+        """
+        heights = (boxes[:, 2] - boxes[:, 0]) * scale_factor
+        widths = (boxes[:, 3] - boxes[:, 1]) * scale_factor
+        longer = np.maximum(heights, widths)
+        shorter = np.minimum(heights, widths)
+        fill = areas / ((boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1]))
+        touches_edge = (
+            (boxes[:, 0] == 0)
+            | (boxes[:, 1] == 0)
+            | (boxes[:, 2] == shape[0])
+            | (boxes[:, 3] == shape[1])
+        )
+        return (
+            (longer >= MIN_COMPONENT_SIZE)
+            & (heights <= MAX_COMPONENT_HEIGHT)
+            & (longer <= MAX_ASPECT_RATIO * shorter)
+            & ~((fill > MAX_FILL_RATIO) & (shorter > MAX_STROKE_WIDTH))
+            & ~touches_edge
+        )
@@ -0,0 +1,52 @@
+import logging
+from collections.abc import Iterator, Sequence
+from typing import override
+
+import pymupdf
+
+from borders import FourBorders
+from .base import BoundsExtractor, ExtractionRun
+from .digest import get_page_digests
+
+
+class DeduplicatingBoundsExtractor(BoundsExtractor):
+    """
+    Runs the wrapped extractor only on the first of each set of identical pages
+    (same content, resources, annotations, boxes and rotation) and reuses its
+    bounds for the repeats, such as blank separators or repeated forms.
+    """
+
+    def __init__(self, extractor: BoundsExtractor, borders: FourBorders):
+        super().__init__(borders)
+        self._extractor = extractor
+
+    @override
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
+        page_numbers = list(self._get_page_numbers(doc, pages))
+        digests = get_page_digests(doc, page_numbers)
+        # First page of each digest, in page order.
+        first_pages: dict[str, int] = {}
+        for page_number, digest in zip(page_numbers, digests):
+            first_pages.setdefault(digest, page_number)
+        unique = list(first_pages.values())
+
+        bounds_by_digest: dict[str, pymupdf.Rect | None] = {}
+        with ExtractionRun(self._extractor, doc, dpi, unique) as extracted:
+            for digest in digests:
+                if digest not in bounds_by_digest:
+                    bounds_by_digest[digest] = next(extracted)
+                bounds = bounds_by_digest[digest]
+                yield pymupdf.Rect(bounds) if bounds is not None else None
+
+        reused = len(page_numbers) - len(unique)
+        logging.info(
+            "Page dedupe: reused the bounds of an identical page for %d of %d pages (%.1f%% hit rate).",
+            reused,
+            len(page_numbers),
+            100 * reused / len(page_numbers) if page_numbers else 0.0,
+        )
@@ -0,0 +1,92 @@
+import hashlib
+import re
+from collections.abc import Sequence
+
+import pymupdf
+
+# Indirect object references, e.g. "12 0 R".
+REFERENCE = re.compile(r"\b(\d+)\s+\d+\s+R\b")
+# References back to the page or its parents, which would pull in the whole page tree.
+BACK_REFERENCE = re.compile(r"/(?:Parent|P)\s+\d+\s+\d+\s+R\b")
+# Page entries that affect how the page looks.
+PAGE_KEYS = ("Contents", "Resources", "Annots", "Group")
+# Page entries inherited from the page tree when the page does not set them.
+INHERITED_KEYS = ("Resources",)
+
+
+class PageDigester:
+    """
+    Digests everything that affects how a page of ``doc`` looks: its boxes and
+    rotation, content streams, resources and annotations. Objects are numbered
+    in the order they are reached, so identical pages get the same digest in
+    any document. Streams shared by several pages are hashed only once.
+    """
+
+    def __init__(self, doc: pymupdf.Document):
+        self._doc = doc
+        self._stream_digests: dict[int, bytes] = {}
+
+    def get_digest(self, page_number: int) -> str:
+        page = self._doc.load_page(page_number)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((tuple(page.mediabox), tuple(page.cropbox), page.rotation)).encode())
+
+        # Objects in the order they were reached from the page, and their positions.
+        reached: list[int] = []
+        numbers: dict[int, int] = {}
+        for key in PAGE_KEYS:
+            value = self._get_page_value(page.xref, key)
+            digest.update(f"/{key} {self._canonicalize(value, reached, numbers)}".encode())
+        i = 0
+        while i < len(reached):
+            xref = reached[i]
+            i += 1
+            source = self._doc.xref_object(xref, compressed=True)
+            digest.update(self._canonicalize(source, reached, numbers).encode())
+            if self._doc.xref_is_stream(xref):
+                digest.update(self._get_stream_digest(xref))
+        return digest.hexdigest()
+
+    def _get_page_value(self, xref: int, key: str) -> str:
+        visited = set()
+        while True:
+            kind, value = self._doc.xref_get_key(xref, key)
+            if kind != "null" or key not in INHERITED_KEYS:
+                return value
+            kind, parent = self._doc.xref_get_key(xref, "Parent")
+            visited.add(xref)
+            if kind != "xref":
+                return value
+            xref = int(parent.split()[0])
+            if xref in visited:
+                return value
+
+    def _canonicalize(self, source: str, reached: list[int], numbers: dict[int, int]) -> str:
+        """Replace the object numbers in ``source`` with their position in ``reached``."""
+
+        def replace(match: re.Match) -> str:
+            xref = int(match.group(1))
+            if not 0 < xref < self._doc.xref_length():
+                return match.group(0)
+            if xref not in numbers:
+                numbers[xref] = len(reached)
+                reached.append(xref)
+            return f"@{numbers[xref]}"
+
+        return REFERENCE.sub(replace, BACK_REFERENCE.sub("", source))
+
+    def _get_stream_digest(self, xref: int) -> bytes:
+        if xref not in self._stream_digests:
+            stream = self._doc.xref_stream_raw(xref) or b""
+            self._stream_digests[xref] = hashlib.blake2b(stream, digest_size=16).digest()
+        return self._stream_digests[xref]
+
+
+def get_page_digests(doc: pymupdf.Document, page_numbers: Sequence[int]) -> list[str]:
+    """
+    Digests of the pages ``page_numbers``. Extractors that wrap another one
+    take them before they yield any bounds: croppers change each page (e.g. its
+    CropBox) as soon as they get its bounds, which would change its digest.
+    """
+    digester = PageDigester(doc)
+    return [digester.get_digest(page_number) for page_number in page_numbers]
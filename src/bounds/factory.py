@@ -1,12 +1,17 @@
 from borders import FourBorders
 from .base import BoundsExtractor
+from .bbox_bounds import BBoxBoundsExtractor
+from .component_bounds import ComponentBoundsExtractor
 from .histogram_bounds import HistogramBoundsExtractor
 from .ocr_bounds import OCRBoundsExtractor
 from .page_bounds import PageBoundsExtractor
-from .text_bounds import (DictTextAndImageBoundsExtractor,
+from .text_bounds import (BlockRectAndImageBoundsExtractor,
+                                BlockRectBoundsExtractor,
+                                DictTextAndImageBoundsExtractor,
                                 DictTextBoundsExtractor,
                                 TextBlocksAndImageBoundsExtractor,
                                 TextPageBoundsExtractor)
+from .settings import ExtractorSettings
 
 EXTRACTOR_MAPPING: dict[str, type[BoundsExtractor]] = {
     "page_bounds": PageBoundsExtractor,
@@ -14,14 +19,31 @@ EXTRACTOR_MAPPING: dict[str, type[BoundsExtractor]] = {
     "dict_text": DictTextBoundsExtractor,
     "text_page_images": TextBlocksAndImageBoundsExtractor,
     "dict_text_images": DictTextAndImageBoundsExtractor,
+    "text_blocks": BlockRectBoundsExtractor,
+    "text_blocks_images": BlockRectAndImageBoundsExtractor,
     "ocr": OCRBoundsExtractor,
     "histogram": HistogramBoundsExtractor,
+    "components": ComponentBoundsExtractor,
+    "bbox": BBoxBoundsExtractor,
 }
 
 
-def get_bounds_extractor(name: str, borders: FourBorders) -> BoundsExtractor:
+def get_bounds_extractor(
+    name: str,
+    borders: FourBorders,
+    settings: ExtractorSettings = ExtractorSettings(),
+) -> BoundsExtractor:
     try:
         cls = EXTRACTOR_MAPPING[name]
     except KeyError:
         raise ValueError(f"Unknown bounds extractor: {name!r}")
-    return cls(borders)
+    return cls(borders, settings)
+
+
+def get_keyed_settings(name: str, settings: ExtractorSettings) -> dict:
+    """The settings that change the bounds of the extractor ``name``, e.g. for cache keys."""
+    try:
+        cls = EXTRACTOR_MAPPING[name]
+    except KeyError:
+        raise ValueError(f"Unknown bounds extractor: {name!r}")
+    return settings.get_keyed(cls.keyed_settings)
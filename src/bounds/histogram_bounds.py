@@ -1,318 +1,181 @@
+from collections.abc import Iterator, Sequence
 from typing import override
 
+import numpy as np
 import pymupdf
-from PIL import Image
-from tqdm import tqdm
 
-from .base import BoundsExtractor
-from collections import Counter
+from .band_scanner import BandScanner
+from .raster import PDF_DPI, RasterBoundsExtractor
 
+# DPI of the first pass of the multi-resolution mode.
+COARSE_DPI = 36
+# Half-width of the refinement strips around each coarse edge, in coarse pixels.
+REFINE_MARGIN = 2
+# Device pixels rendered around every clip and then cut off.
+CLIP_PADDING = 2
 
-class HistogramBoundsExtractor(BoundsExtractor):
-    @override
-    def get_bounds(self, doc: pymupdf.Document, dpi: int | None) -> list[pymupdf.Rect]:
-        rectangles: list[pymupdf.Rect] = []
-        for i in tqdm(range(doc.page_count)):
-            page = doc.load_page(i)
-            pix: pymupdf.Pixmap = (
-                page.get_pixmap(dpi=dpi) if dpi is not None else page.get_pixmap()
-            )  # type:ignore
-            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-            pixels: list[tuple[int, int, int]] = list(img.getdata())
-            counter = Counter(pixels)
-            dominant_color, _ = counter.most_common(1)[0]
-            left_cut, top_cut, right_cut, bottom_cut = self._get_border_cuts(
-                pixels,
-                img.size,
-                dominant_color,
-            )
-
-            leftmost_point = self._get_leftmost_point(
-                pixels,
-                img.size,
-                dominant_color,
-                left_cut,
-                right_cut,
-                top_cut,
-                bottom_cut,
-            )
-            if self._is_empty_page(leftmost_point):
-                rect = self._get_rectangle(
-                    bounds=pymupdf.Rect(),
-                    has_content=False,
-                    page_rect=page.rect,
-                )
-                rectangles.append(rect)
-                continue
-            topmost_point = self._get_topmost_point(
-                pixels,
-                img.size,
-                dominant_color,
-                left_cut,
-                right_cut,
-                top_cut,
-                bottom_cut,
-            )
-            rightmost_point = self._get_rightmost_point(
-                pixels,
-                img.size,
-                dominant_color,
-                left_cut,
-                right_cut,
-                top_cut,
-                bottom_cut,
-            )
-            bottommost_point = self._get_bottommost_point(
-                pixels,
-                img.size,
-                dominant_color,
-                left_cut,
-                right_cut,
-                top_cut,
-                bottom_cut,
-            )
+Edges = tuple[float, float, float, float]
 
-            x0 = leftmost_point[0]
-            y0 = topmost_point[1]
-            x1 = rightmost_point[0]
-            y1 = bottommost_point[1]
 
-            if dpi is not None:
-                # Pixel coordinates at custom DPI must be mapped back to PDF points.
-                scale_factor = 72.0 / dpi
-                x0 *= scale_factor
-                y0 *= scale_factor
-                x1 *= scale_factor
-                y1 *= scale_factor
+class HistogramBoundsExtractor(RasterBoundsExtractor):
+    keyed_settings = RasterBoundsExtractor.keyed_settings + ("multi_resolution", "band_budget")
 
-            rect = self._get_rectangle(
-                bounds=pymupdf.Rect(
-                    x0=x0,
-                    y0=y0,
-                    x1=x1,
-                    y1=y1,
-                ),
-                has_content=True,
-                page_rect=page.rect,
-            )
-            rectangles.append(rect)
-        return rectangles
-
-    def _get_leftmost_point(
-        self,
-        pixels: list[tuple[int, int, int]],
-        img_size: tuple[int, int],
-        color: tuple[int, int, int],
-        left_cut: int,
-        right_cut: int,
-        top_cut: int,
-        bottom_cut: int,
-    ) -> tuple[int, int]:
-        width, height = img_size
-        min_col = left_cut
-        max_col = width - 1 - right_cut
-        min_row = top_cut
-        max_row = height - 1 - bottom_cut
-        for j in range(min_col, max_col + 1):
-            for i in range(min_row, max_row + 1):
-                if self._pixel_at(pixels, width, i, j) != color:
-                    return (j, i)
-        return (-1, -1)
-
-    def _is_empty_page(self, leftmost_point: tuple[int, int]) -> bool:
-        return leftmost_point == (-1, -1)
-
-    def _get_topmost_point(
+    @override
+    def iter_raw_bounds(
         self,
-        pixels: list[tuple[int, int, int]],
-        img_size: tuple[int, int],
-        color: tuple[int, int, int],
-        left_cut: int,
-        right_cut: int,
-        top_cut: int,
-        bottom_cut: int,
-    ) -> tuple[int, int]:
-        width, height = img_size
-        min_col = left_cut
-        max_col = width - 1 - right_cut
-        min_row = top_cut
-        max_row = height - 1 - bottom_cut
-        for i in range(min_row, max_row + 1):
-            for j in range(min_col, max_col + 1):
-                if self._pixel_at(pixels, width, i, j) != color:
-                    return (j, i)
-        return (min_col, min_row)
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
+        for page in self._iter_pages(doc, pages):
+            page_dpi = self._get_page_dpi(page, dpi)
+            if self._settings.band_budget is not None:
+                edges = self._get_banded_edges(page, page_dpi)
+            elif self._settings.multi_resolution:
+                edges = self._get_refined_edges(page, page_dpi)
+            else:
+                edges = self._get_edges(page, page_dpi)
+            if edges is None:
+                yield None
+                continue
 
-    def _get_rightmost_point(
-        self,
-        pixels: list[tuple[int, int, int]],
-        img_size: tuple[int, int],
-        color: tuple[int, int, int],
-        left_cut: int,
-        right_cut: int,
-        top_cut: int,
-        bottom_cut: int,
-    ) -> tuple[int, int]:
-        width, height = img_size
-        min_col = left_cut
-        max_col = width - 1 - right_cut
-        min_row = top_cut
-        max_row = height - 1 - bottom_cut
-        for j in range(max_col, min_col - 1, -1):
-            for i in range(max_row, min_row - 1, -1):
-                if self._pixel_at(pixels, width, i, j) != color:
-                    return (j, i)
-        return (max_col, max_row)
+            x0, y0, x1, y1 = edges
+            yield pymupdf.Rect(x0=x0, y0=y0, x1=x1, y1=y1)
+
+    def _get_edges(self, page: pymupdf.Page, dpi: int | None) -> Edges | None:
+        """Content edges of the page in PDF points, or None for empty pages."""
+        pix = self._render_page(page, dpi)
+        _, _, edges = self._analyze_pixmap(pix)
+        if edges is None:
+            return None
+        # Pixel coordinates at custom DPI must be mapped back to PDF points.
+        scale_factor = self._get_scale_factor(dpi)
+        x0, y0, x1, y1 = (edge * scale_factor for edge in edges)
+        return x0, y0, x1, y1
+
+    def _get_banded_edges(self, page: pymupdf.Page, dpi: int | None) -> Edges | None:
+        """
+        Scan the page inward from its edges in bands that fit the band budget;
+        the background color is estimated from a thumbnail of the page.
+        """
+        band_pixels = self._get_band_pixels()
+        assert band_pixels is not None
+        thumbnail = self._render_page(page, self._get_band_dpi(page, COARSE_DPI))
+        color = self._background_estimator.estimate(self._pixmap_to_array(thumbnail))
+        del thumbnail
+
+        def render_background(band: pymupdf.IRect) -> np.ndarray:
+            return self._render_background(page, dpi, color, band)
+
+        size = self._get_page_size(page, dpi)
+        _, edges = BandScanner(render_background, band_pixels).scan(size.width, size.height)
+        if edges is None:
+            return None
+        scale_factor = self._get_scale_factor(dpi)
+        x0, y0, x1, y1 = (edge * scale_factor for edge in edges)
+        return x0, y0, x1, y1
+
+    def _render_background(
+        self, page: pymupdf.Page, dpi: int | None, color: tuple[int, ...], area: pymupdf.IRect
+    ) -> np.ndarray:
+        """
+        Background mask of the device pixels ``area`` of the page, as in a
+        full-page render. The clip is padded by ``CLIP_PADDING`` pixels: without
+        anti-aliasing, MuPDF leaves out hairlines on the edge rows and columns
+        of a clip.
+        """
+        scale_factor = self._get_scale_factor(dpi)
+        padded = pymupdf.Rect(
+            area.x0 - CLIP_PADDING,
+            area.y0 - CLIP_PADDING,
+            area.x1 + CLIP_PADDING,
+            area.y1 + CLIP_PADDING,
+        )
+        pix = self._render_page(page, dpi, padded * pymupdf.Matrix(scale_factor, scale_factor))
+        background = self._get_background_mask(
+            self._pixmap_to_array(pix),
+            (pix.width, pix.height),
+            color,
+            self._render_profile.background_tolerance,
+        )
+        return background[
+            area.y0 - pix.y : area.y1 - pix.y,
+            area.x0 - pix.x : area.x1 - pix.x,
+        ]
+
+    def _get_refined_edges(self, page: pymupdf.Page, dpi: int | None) -> Edges | None:
+        """
+        Locate the content at ``COARSE_DPI`` first and then re-render only thin
+        strips around each of the four edges at the requested DPI.
+        """
+        target_dpi = dpi if dpi is not None else PDF_DPI
+        if target_dpi <= COARSE_DPI:
+            return self._get_edges(page, dpi)
+
+        coarse = self._render_page(page, COARSE_DPI)
+        color, cuts, edges = self._analyze_pixmap(coarse)
+        if edges is None:
+            return None
+
+        scale = self._get_scale_factor(COARSE_DPI)
+        left_cut, top_cut, right_cut, bottom_cut = cuts
+        inner = pymupdf.Rect(
+            left_cut * scale,
+            top_cut * scale,
+            (coarse.width - right_cut) * scale,
+            (coarse.height - bottom_cut) * scale,
+        )
+        x0, y0, x1, y1 = edges
+        box = pymupdf.Rect(x0 * scale, y0 * scale, (x1 + 1) * scale, (y1 + 1) * scale)
+        margin = REFINE_MARGIN * scale
+
+        left_strip = pymupdf.Rect(box.x0 - margin, box.y0 - margin, box.x0 + margin, box.y1 + margin)
+        right_strip = pymupdf.Rect(box.x1 - margin, box.y0 - margin, box.x1 + margin, box.y1 + margin)
+        top_strip = pymupdf.Rect(box.x0 - margin, box.y0 - margin, box.x1 + margin, box.y0 + margin)
+        bottom_strip = pymupdf.Rect(box.x0 - margin, box.y1 - margin, box.x1 + margin, box.y1 + margin)
+
+        left = self._refine_edge(page, dpi, color, left_strip & inner, x0 * scale, True, True)
+        right = self._refine_edge(page, dpi, color, right_strip & inner, x1 * scale, True, False)
+        top = self._refine_edge(page, dpi, color, top_strip & inner, y0 * scale, False, True)
+        bottom = self._refine_edge(page, dpi, color, bottom_strip & inner, y1 * scale, False, False)
+        return left, top, right, bottom
 
-    def _get_bottommost_point(
+    def _refine_edge(
         self,
-        pixels: list[tuple[int, int, int]],
-        img_size: tuple[int, int],
-        color: tuple[int, int, int],
-        left_cut: int,
-        right_cut: int,
-        top_cut: int,
-        bottom_cut: int,
-    ) -> tuple[int, int]:
-        width, height = img_size
-        min_col = left_cut
-        max_col = width - 1 - right_cut
-        min_row = top_cut
-        max_row = height - 1 - bottom_cut
-        for i in range(max_row, min_row - 1, -1):
-            for j in range(max_col, min_col - 1, -1):
-                if self._pixel_at(pixels, width, i, j) != color:
-                    return (j, i)
-        return (max_col, max_row)
+        page: pymupdf.Page,
+        dpi: int | None,
+        color: tuple[int, ...],
+        clip: pymupdf.Rect,
+        fallback: float,
+        vertical: bool,
+        from_start: bool,
+    ) -> float:
+        """
+        Render ``clip`` and return the position (in PDF points) of its first or
+        last content column (``vertical``) or row, or ``fallback`` if it is blank.
+        """
+        if clip.is_empty:
+            return fallback
+        scale_factor = self._get_scale_factor(dpi)
+        # The device pixels a render of ``clip`` would cover.
+        area = (clip * pymupdf.Matrix(1 / scale_factor, 1 / scale_factor)).irect
+        background = self._render_background(page, dpi, color, area)
+        lines = ~background.all(axis=0 if vertical else 1)
+        if not lines.any():
+            return fallback
+        if from_start:
+            index = self._leading_run(~lines)
+        else:
+            index = lines.size - 1 - self._leading_run(~lines[::-1])
+        # Clipped pixmaps share the pixel grid of a full-page render at the same DPI.
+        origin = area.x0 if vertical else area.y0
+        return (origin + index) * scale_factor
 
     def _get_border_cuts(
         self,
-        pixels: list[tuple[int, int, int]],
+        pixels: np.ndarray | Sequence[tuple[int, ...]],
         img_size: tuple[int, int],
-        dominant_color: tuple[int, int, int],
+        dominant_color: tuple[int, ...],
     ) -> tuple[int, int, int, int]:
-        width, height = img_size
-        left = self._scan_left_border(pixels, width, height, dominant_color)
-        right = self._scan_right_border(pixels, width, height, dominant_color, left)
-        top = self._scan_top_border(pixels, width, height, dominant_color, left, right)
-        bottom = self._scan_bottom_border(pixels, width, height, dominant_color, left, right, top)
-        return left, top, right, bottom
-
-    def _scan_left_border(
-        self,
-        pixels: list[tuple[int, int, int]],
-        width: int,
-        height: int,
-        dominant_color: tuple[int, int, int],
-    ) -> int:
-        left_cut = 0
-        for col in range(width):
-            if self._is_non_background_column(pixels, width, height, col, dominant_color):
-                left_cut += 1
-                continue
-            break
-        return left_cut
-
-    def _scan_right_border(
-        self,
-        pixels: list[tuple[int, int, int]],
-        width: int,
-        height: int,
-        dominant_color: tuple[int, int, int],
-        left_cut: int,
-    ) -> int:
-        right_cut = 0
-        for col in range(width - 1, left_cut - 1, -1):
-            if self._is_non_background_column(pixels, width, height, col, dominant_color):
-                right_cut += 1
-                continue
-            break
-        return right_cut
-
-    def _scan_top_border(
-        self,
-        pixels: list[tuple[int, int, int]],
-        width: int,
-        height: int,
-        dominant_color: tuple[int, int, int],
-        left_cut: int,
-        right_cut: int,
-    ) -> int:
-        top_cut = 0
-        start_col = left_cut
-        end_col = width - 1 - right_cut
-        for row in range(height):
-            if self._is_non_background_row(
-                pixels,
-                width,
-                row,
-                start_col,
-                end_col,
-                dominant_color,
-            ):
-                top_cut += 1
-                continue
-            break
-        return top_cut
-
-    def _scan_bottom_border(
-        self,
-        pixels: list[tuple[int, int, int]],
-        width: int,
-        height: int,
-        dominant_color: tuple[int, int, int],
-        left_cut: int,
-        right_cut: int,
-        top_cut: int,
-    ) -> int:
-        bottom_cut = 0
-        start_col = left_cut
-        end_col = width - 1 - right_cut
-        for row in range(height - 1, top_cut - 1, -1):
-            if self._is_non_background_row(
-                pixels,
-                width,
-                row,
-                start_col,
-                end_col,
-                dominant_color,
-            ):
-                bottom_cut += 1
-                continue
-            break
-        return bottom_cut
-
-    def _is_non_background_row(
-        self,
-        pixels: list[tuple[int, int, int]],
-        width: int,
-        row: int,
-        start_col: int,
-        end_col: int,
-        dominant_color: tuple[int, int, int],
-    ) -> bool:
-        if start_col > end_col:
-            return False
-        for col in range(start_col, end_col + 1):
-            value = self._pixel_at(pixels, width, row, col)
-            if value == dominant_color:
-                return False
-        return True
-
-    def _is_non_background_column(
-        self,
-        pixels: list[tuple[int, int, int]],
-        width: int,
-        height: int,
-        col: int,
-        dominant_color: tuple[int, int, int],
-    ) -> bool:
-        for row in range(height):
-            value = self._pixel_at(pixels, width, row, col)
-            if value == dominant_color:
-                return False
-        return True
-
-    @staticmethod
-    def _pixel_at(pixels: list[tuple[int, int, int]], width, i: int, j: int) -> tuple[int, int, int]:
-        return pixels[i * width + j]
+        background = self._get_background_mask(pixels, img_size, dominant_color)
+        return self._get_mask_border_cuts(background)
@@ -0,0 +1,77 @@
+import logging
+from collections.abc import Iterator, Sequence
+from typing import override
+
+import pymupdf
+
+from borders import FourBorders
+from .base import BoundsExtractor, ExtractionRun
+from .digest import get_page_digests
+from .factory import get_keyed_settings
+from .settings import ExtractorSettings
+from .sidecar import BoundsSidecar
+
+
+class IncrementalBoundsExtractor(BoundsExtractor):
+    """
+    Reuses the raw bounds of the pages whose digest is recorded in the manifest
+    of the previous run (a sidecar with page digests) and runs the wrapped
+    extractor only on new and changed pages. Once all bounds are yielded,
+    ``manifest`` holds the manifest of this run. ``options`` are those of the
+    extractors it wraps, e.g. ``{"sample_pages": 16}``; they are recorded with
+    the settings, so bounds inferred by sampling are not reused by other runs.
+    """
+
+    def __init__(
+        self,
+        extractor: BoundsExtractor,
+        extractor_name: str,
+        previous: BoundsSidecar | None,
+        borders: FourBorders,
+        settings: ExtractorSettings = ExtractorSettings(),
+        options: dict | None = None,
+    ):
+        super().__init__(borders, settings)
+        self._extractor = extractor
+        self._extractor_name = extractor_name
+        self._previous = previous
+        self._options = options or {}
+        self.manifest: BoundsSidecar | None = None
+
+    @override
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
+        page_numbers = list(self._get_page_numbers(doc, pages))
+        digests = get_page_digests(doc, page_numbers)
+        # Measured, like the digests, before the pages are cropped.
+        page_sizes = [(doc[n].rect.width, doc[n].rect.height) for n in page_numbers]
+
+        previous_bounds: dict[str, pymupdf.Rect | None] = {}
+        if self._previous is None:
+            logging.info("No manifest of a previous run; extracting all pages.")
+        elif not self._previous.has_same_extraction(self._extractor_name, dpi, self._settings, self._options):
+            logging.info("The manifest was made with other extraction options; extracting all pages.")
+        else:
+            previous_bounds = dict(zip(self._previous.digests, self._previous.bounds))
+        changed = [n for n, digest in zip(page_numbers, digests) if digest not in previous_bounds]
+        logging.info("Incremental run: extracting %d of %d pages.", len(changed), len(page_numbers))
+
+        bounds: list[pymupdf.Rect | None] = []
+        with ExtractionRun(self._extractor, doc, dpi, changed) as extracted:
+            for digest in digests:
+                rect = previous_bounds[digest] if digest in previous_bounds else next(extracted)
+                bounds.append(rect)
+                yield pymupdf.Rect(rect) if rect is not None else None
+
+        self.manifest = BoundsSidecar(
+            extractor=self._extractor_name,
+            dpi=dpi,
+            settings={**get_keyed_settings(self._extractor_name, self._settings), **self._options},
+            page_sizes=page_sizes,
+            bounds=bounds,
+            digests=digests,
+        )
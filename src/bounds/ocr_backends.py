@@ -0,0 +1,105 @@
+from abc import ABC, abstractmethod
+from typing import override
+
+import pymupdf
+import pytesseract
+from PIL import Image, ImageOps
+
+try:
+    import tesserocr
+except ImportError:  # optional dependency, needed only by TesserocrBackend
+    tesserocr = None
+
+# (x0, y0, x1, y1) of a recognized word in pixels of the OCR'd image.
+WordBox = tuple[int, int, int, int]
+
+
+class OCRBackend(ABC):
+    """Finds word boxes in page images. One instance serves a whole document."""
+
+    @abstractmethod
+    def get_word_boxes(self, pix: pymupdf.Pixmap) -> list[WordBox]:
+        pass
+
+    def close(self) -> None:
+        """Release the resources held by the OCR engine."""
+
+
+class PytesseractBackend(OCRBackend):
+    """Runs the `tesseract` executable once per image."""
+
+    @override
+    def get_word_boxes(self, pix: pymupdf.Pixmap) -> list[WordBox]:
+        mode = "L" if pix.n == 1 else "RGB"
+        img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+        gray = img if img.mode == "L" else ImageOps.grayscale(img)
+        ocr_data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
+        return [
+            (left, top, left + width, top + height)
+            for word, left, top, width, height in zip(
+                ocr_data["text"],
+                ocr_data["left"],
+                ocr_data["top"],
+                ocr_data["width"],
+                ocr_data["height"],
+            )
+            if word.strip()
+        ]
+
+
+class TesserocrBackend(OCRBackend):
+    """
+    Keeps one in-process Tesseract API, so the language model is loaded once
+    per document, and feeds it the raw pixmap samples.
+    """
+
+    def __init__(self):
+        if tesserocr is None:
+            raise ImportError(
+                "The `tesserocr` OCR backend requires the tesserocr package "
+                "(`pdm install -G tesserocr`)."
+            )
+        self._api = tesserocr.PyTessBaseAPI()
+
+    @override
+    def get_word_boxes(self, pix: pymupdf.Pixmap) -> list[WordBox]:
+        if pix.n != 1:
+            pix = pymupdf.Pixmap(pymupdf.csGRAY, pix)
+        self._api.SetImageBytes(pix.samples, pix.width, pix.height, pix.n, pix.stride)
+        self._api.Recognize()
+        iterator = self._api.GetIterator()
+        if iterator is None:
+            return []
+        word_level = tesserocr.RIL.WORD
+        boxes: list[WordBox] = []
+        for word in tesserocr.iterate_level(iterator, word_level):
+            try:
+                text = word.GetUTF8Text(word_level)
+            except RuntimeError:
+                # raised for words without any recognized text
+                continue
+            if not text or not text.strip():
+                continue
+            box = word.BoundingBox(word_level)
+            # None for words without a box, like empty ones
+            if box is not None:
+                boxes.append(box)
+        return boxes
+
+    @override
+    def close(self) -> None:
+        self._api.End()
+
+
+OCR_BACKEND_MAPPING: dict[str, type[OCRBackend]] = {
+    "pytesseract": PytesseractBackend,
+    "tesserocr": TesserocrBackend,
+}
+
+
+def get_ocr_backend(name: str) -> OCRBackend:
+    try:
+        cls = OCR_BACKEND_MAPPING[name]
+    except KeyError:
+        raise ValueError(f"Unknown OCR backend: {name!r}")
+    return cls()
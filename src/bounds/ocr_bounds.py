@@ -1,61 +1,253 @@
+import math
+import statistics
+from collections import deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, wait
 from typing import override
 
+import numpy as np
 import pymupdf
-import pytesseract
-from PIL import Image, ImageOps
-from tqdm import tqdm
 
-from .base import BoundsExtractor
+from .ocr_backends import WordBox, get_ocr_backend
+from .ocr_pool import OCRPool
+from .raster import PDF_DPI, RasterBoundsExtractor
 
+# Overlap of consecutive OCR bands in PDF points, so that a text line cut by the
+# boundary of one band is read whole from its neighbour.
+BAND_OVERLAP = 36.0
+# DPI of the raster pass that trims the uniform background before OCR.
+TRIM_DPI = 72
+# Space kept around the trimmed content, in PDF points.
+TRIM_MARGIN = 4.0
+# Approximate ratio of the x-height to the height of a line of text.
+X_HEIGHT_RATIO = 0.5
+# DPI of the raster pass that measures the text lines of a page for the x-height.
+LINE_HEIGHT_DPI = 96
+# Vertical strips of the page whose text lines are measured separately, so that
+# the lines of side-by-side columns are not merged.
+LINE_HEIGHT_STRIPS = 4
+# Heights (in PDF points) of the runs of rows counted as text lines; lower runs
+# are rules or underlines, higher ones figures or vertical lines.
+MIN_LINE_HEIGHT = 3.0
+MAX_LINE_HEIGHT = 72.0
+# Images queued in shared memory per OCR worker process.
+MAX_IMAGES_PER_WORKER = 2
+
+
+class OCRBoundsExtractor(RasterBoundsExtractor):
+    keyed_settings = RasterBoundsExtractor.keyed_settings + (
+        "band_budget",
+        "ocr_backend",
+        "ocr_trim",
+        "ocr_x_height",
+    )
 
-class OCRBoundsExtractor(BoundsExtractor):
     @override
-    def get_bounds(self, doc: pymupdf.Document, dpi: int | None) -> list[pymupdf.Rect]:
-        dpi_to_use = dpi if dpi is not None else 500
-        dpi_pdf = 72.0
-        scale_factor = dpi_pdf / dpi_to_use
-
-        rectangles: list[pymupdf.Rect] = []
-        for i in tqdm(range(doc.page_count)):
-            page = doc.load_page(i)
-            x0, y0 = float("inf"), float("inf")
-            x1, y1 = 0, 0
-
-            raster_img: pymupdf.Pixmap = page.get_pixmap(dpi=dpi_to_use)  # type:ignore
-            img = Image.frombytes(
-                "RGB", (raster_img.width, raster_img.height), raster_img.samples
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
+        ocr_pages = self._iter_ocr_pages(doc, dpi, pages)
+        if self._settings.ocr_workers > 1:
+            page_words = self._iter_pooled_words(ocr_pages)
+        else:
+            page_words = self._iter_words(ocr_pages)
+        for _, words in page_words:
+            if not words:
+                yield None
+                continue
+            yield pymupdf.Rect(
+                x0=min(word.x0 for word in words),
+                y0=min(word.y0 for word in words),
+                x1=max(word.x1 for word in words),
+                y1=max(word.y1 for word in words),
             )
-            # img.save("output/test.png")
-            gray = ImageOps.grayscale(img)
-            ocr_data = pytesseract.image_to_data(
-                gray, output_type=pytesseract.Output.DICT
-            )
-            text_data = ocr_data["text"]
-            for word, left, top, width, height in zip(
-                text_data,
-                ocr_data["left"],
-                ocr_data["top"],
-                ocr_data["width"],
-                ocr_data["height"],
-            ):
-                if not word.strip():
+
+    def _iter_ocr_pages(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None,
+    ) -> Iterator[tuple[pymupdf.Page, int, Iterator[pymupdf.Pixmap]]]:
+        """
+        Yield every page with its OCR DPI and (lazily rendered) images; pages
+        found blank by the trim pass get no images.
+        """
+        for page in self._iter_pages(doc, pages):
+            dpi_to_use = self._get_page_dpi(page, dpi if dpi is not None else 500)
+            dpi_to_use = self._get_x_height_dpi(page, dpi_to_use)
+            clip = None
+            if self._settings.ocr_trim:
+                clip = self._get_content_clip(page)
+                if clip is None:
+                    yield page, dpi_to_use, iter(())
                     continue
-                # convert pixel coords → PDF‐point coords
-                bx0 = left * scale_factor
-                by0 = top * scale_factor
-                bx1 = (left + width) * scale_factor
-                by1 = (top + height) * scale_factor
-                x0, y0 = min(x0, bx0), min(y0, by0)
-                x1, y1 = max(x1, bx1), max(y1, by1)
-            rect = self._get_rectangle(
-                bounds=pymupdf.Rect(
-                    x0=x0,
-                    y0=y0,
-                    x1=x1,
-                    y1=y1,
-                ),
-                has_content=any(text_data),
-                page_rect=page.rect,
-            )
-            rectangles.append(rect)
-        return rectangles
+            yield page, dpi_to_use, self._iter_ocr_images(page, dpi_to_use, clip)
+
+    def _iter_words(
+        self, pages: Iterator[tuple[pymupdf.Page, int, Iterator[pymupdf.Pixmap]]]
+    ) -> Iterator[tuple[pymupdf.Page, list[pymupdf.Rect]]]:
+        """Run OCR in this process and yield the word boxes of every page in PDF points."""
+        backend = get_ocr_backend(self._settings.ocr_backend)
+        try:
+            for page, dpi, images in pages:
+                scale_factor = self._get_scale_factor(dpi)
+                words = [
+                    self._get_word_rect(raster_img, box, scale_factor)
+                    for raster_img in images
+                    for box in backend.get_word_boxes(raster_img)
+                ]
+                yield page, words
+        finally:
+            backend.close()
+
+    def _iter_pooled_words(
+        self, pages: Iterator[tuple[pymupdf.Page, int, Iterator[pymupdf.Pixmap]]]
+    ) -> Iterator[tuple[pymupdf.Page, list[pymupdf.Rect]]]:
+        """
+        Render pages in this process while worker processes run OCR, and yield
+        the word boxes of every page in page order. At most
+        ``MAX_IMAGES_PER_WORKER`` images per worker wait in shared memory.
+        """
+        workers = self._settings.ocr_workers
+        max_in_flight = MAX_IMAGES_PER_WORKER * workers
+        # (page, scale factor, [(image origin, future word boxes)]) in page order
+        pending: deque[tuple[pymupdf.Page, float, list[tuple[pymupdf.Point, Future[list[WordBox]]]]]] = deque()
+        in_flight: deque[Future[list[WordBox]]] = deque()
+        pool = OCRPool(self._settings.ocr_backend, workers)
+        try:
+            for page, dpi, images in pages:
+                jobs: list[tuple[pymupdf.Point, Future[list[WordBox]]]] = []
+                pending.append((page, self._get_scale_factor(dpi), jobs))
+                for raster_img in images:
+                    while in_flight and in_flight[0].done():
+                        in_flight.popleft()
+                    if len(in_flight) >= max_in_flight:
+                        wait([in_flight.popleft()])
+                    future = pool.submit(raster_img)
+                    jobs.append((pymupdf.Point(raster_img.x, raster_img.y), future))
+                    in_flight.append(future)
+                # Hand over finished pages without waiting for the rest.
+                while len(pending) > 1 and all(future.done() for _, future in pending[0][2]):
+                    yield self._collect_words(*pending.popleft())
+            while pending:
+                yield self._collect_words(*pending.popleft())
+        finally:
+            pool.close()
+
+    def _collect_words(
+        self,
+        page: pymupdf.Page,
+        scale_factor: float,
+        jobs: list[tuple[pymupdf.Point, Future[list[WordBox]]]],
+    ) -> tuple[pymupdf.Page, list[pymupdf.Rect]]:
+        words = [
+            self._get_word_rect(origin, box, scale_factor)
+            for origin, future in jobs
+            for box in future.result()
+        ]
+        return page, words
+
+    @staticmethod
+    def _get_word_rect(
+        origin: pymupdf.Pixmap | pymupdf.Point, box: WordBox, scale_factor: float
+    ) -> pymupdf.Rect:
+        """Map a word box in pixels of an image at ``origin`` to PDF points."""
+        left, top, right, bottom = box
+        return pymupdf.Rect(
+            (origin.x + left) * scale_factor,
+            (origin.y + top) * scale_factor,
+            (origin.x + right) * scale_factor,
+            (origin.y + bottom) * scale_factor,
+        )
+
+    def _get_content_clip(self, page: pymupdf.Page) -> pymupdf.Rect | None:
+        """
+        Area of the page left after trimming the uniform background (and border
+        lines) in a cheap low-resolution pass, or None if nothing is left.
+        """
+        pix = self._render_page(page, TRIM_DPI)
+        _, _, edges = self._analyze_pixmap(pix)
+        if edges is None:
+            return None
+        scale_factor = self._get_scale_factor(TRIM_DPI)
+        x0, y0, x1, y1 = edges
+        content = pymupdf.Rect(
+            x0 * scale_factor - TRIM_MARGIN,
+            y0 * scale_factor - TRIM_MARGIN,
+            (x1 + 1) * scale_factor + TRIM_MARGIN,
+            (y1 + 1) * scale_factor + TRIM_MARGIN,
+        )
+        return content & page.rect
+
+    def _get_x_height_dpi(self, page: pymupdf.Page, dpi: int) -> int:
+        """
+        Lower ``dpi`` so that the text of the page renders at the target
+        x-height; keep it for pages without text lines. Measured on the page
+        alone, so that its bounds do not depend on the pages before it.
+        """
+        target = self._settings.ocr_x_height
+        if target is None:
+            return dpi
+        line_height = self._get_line_height(page)
+        if line_height is None:
+            return dpi
+        x_height = line_height * X_HEIGHT_RATIO
+        return max(1, min(dpi, math.ceil(PDF_DPI * target / x_height)))
+
+    def _get_line_height(self, page: pymupdf.Page) -> float | None:
+        """
+        Median height (in PDF points) of the runs of rows with content in each
+        vertical strip of a low-resolution render, i.e. of the text lines of
+        the page, or None if it has none.
+        """
+        line_dpi = self._get_band_dpi(page, LINE_HEIGHT_DPI)
+        pix = self._render_page(page, line_dpi)
+        pixels = self._pixmap_to_array(pix)
+        background = self._get_background_mask(
+            pixels,
+            (pix.width, pix.height),
+            self._background_estimator.estimate(pixels),
+            self._render_profile.background_tolerance,
+        )
+        # Without the border lines, which would join all rows into one run.
+        left, top, right, bottom = self._get_mask_border_cuts(background)
+        content = ~background[top : pix.height - bottom, left : pix.width - right]
+        scale_factor = self._get_scale_factor(line_dpi)
+        heights: list[float] = []
+        for strip in np.array_split(content, LINE_HEIGHT_STRIPS, axis=1):
+            rows = np.concatenate(([False], strip.any(axis=1), [False]))
+            starts_and_stops = np.flatnonzero(rows[1:] != rows[:-1])
+            runs = (starts_and_stops[1::2] - starts_and_stops[::2]) * scale_factor
+            heights.extend(runs[(runs >= MIN_LINE_HEIGHT) & (runs <= MAX_LINE_HEIGHT)].tolist())
+        if not heights:
+            return None
+        return statistics.median(heights)
+
+    def _iter_ocr_images(
+        self,
+        page: pymupdf.Page,
+        dpi: int,
+        clip: pymupdf.Rect | None = None,
+    ) -> Iterator[pymupdf.Pixmap]:
+        """
+        Yield the image of the page (or of its ``clip`` area), or overlapping
+        full-width horizontal bands of it when a band budget is set.
+        """
+        band_pixels = self._get_band_pixels()
+        if band_pixels is None:
+            yield self._render_page(page, dpi, clip)
+            return
+
+        area = self._get_pixel_rect(clip if clip is not None else page.rect, dpi)
+        scale_factor = self._get_scale_factor(dpi)
+        band_rows = max(1, band_pixels // area.width)
+        overlap = min(int(BAND_OVERLAP / scale_factor), band_rows // 2)
+        for top in range(area.y0, area.y1, band_rows - overlap):
+            bottom = min(top + band_rows, area.y1)
+            band = pymupdf.Rect(area.x0, top, area.x1, bottom)
+            yield self._render_page(page, dpi, band * pymupdf.Matrix(scale_factor, scale_factor))
+            if bottom == area.y1:
+                break
@@ -0,0 +1,72 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import pymupdf
+
+from .ocr_backends import OCRBackend, WordBox, get_ocr_backend
+
+# OCR backend of the current worker process, created once by _init_worker.
+_backend: OCRBackend | None = None
+
+
+def _init_worker(backend_name: str) -> None:
+    global _backend
+    _backend = get_ocr_backend(backend_name)
+
+
+def _get_word_boxes(
+    shm_name: str, irect: tuple[int, int, int, int], colorspace_n: int, alpha: bool
+) -> list[WordBox]:
+    assert _backend is not None
+    colorspace = pymupdf.csGRAY if colorspace_n == 1 else pymupdf.csRGB
+    pix = pymupdf.Pixmap(colorspace, pymupdf.IRect(irect), alpha)
+    shm = SharedMemory(name=shm_name)
+    try:
+        samples = pix.samples_mv
+        with shm.buf[: len(samples)] as shared:
+            samples[:] = shared
+    finally:
+        shm.close()
+    return _backend.get_word_boxes(pix)
+
+
+def _release(shm: SharedMemory) -> None:
+    shm.close()
+    shm.unlink()
+
+
+class OCRPool:
+    """
+    Runs OCR in worker processes that each keep one OCR backend. Pixmap samples
+    are handed over through shared memory instead of being pickled; each block
+    is released as soon as its image has been recognized.
+    """
+
+    def __init__(self, backend_name: str, workers: int):
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(backend_name,),
+        )
+
+    def submit(self, pix: pymupdf.Pixmap) -> Future[list[WordBox]]:
+        """Queue ``pix`` for OCR; the caller may drop the pixmap right away."""
+        samples = pix.samples_mv
+        shm = SharedMemory(create=True, size=max(1, len(samples)))
+        shm.buf[: len(samples)] = samples
+        try:
+            future = self._executor.submit(
+                _get_word_boxes,
+                shm.name,
+                tuple(pix.irect),
+                pix.colorspace.n,
+                bool(pix.alpha),
+            )
+        except BaseException:
+            _release(shm)
+            raise
+        future.add_done_callback(lambda _: _release(shm))
+        return future
+
+    def close(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
@@ -1,3 +1,4 @@
+from collections.abc import Iterator, Sequence
 from typing import override
 from .base import BoundsExtractor
 import pymupdf
@@ -7,20 +8,13 @@ class PageBoundsExtractor(BoundsExtractor):
     """Extracts the tightest content bounding‐box on each page."""
 
     @override
-    def get_bounds(
-        self, doc: pymupdf.Document, dpi: int | None
-    ) -> list[pymupdf.Rect]:
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
         _ = dpi
-        rectangles: list[pymupdf.Rect] = []
-        for page in doc:
+        for page in self._iter_doc_pages(doc, pages):
             bounds = page.bound()
-            # expand it by border_pt (on each side)
-            rect = self._get_rectangle(
-                bounds=pymupdf.Rect(
-                    x0=bounds.x0, y0=bounds.y0, x1=bounds.x1, y1=bounds.y1
-                ),
-                has_content=True,
-                page_rect=page.rect,
-            )
-            rectangles.append(rect)
-        return rectangles
+            yield pymupdf.Rect(x0=bounds.x0, y0=bounds.y0, x1=bounds.x1, y1=bounds.y1)
@@ -0,0 +1,105 @@
+import dataclasses
+import logging
+import os
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import override
+
+import pymupdf
+from tqdm import tqdm
+
+from borders import FourBorders
+from .base import BoundsExtractor
+from .factory import get_bounds_extractor
+from .settings import ExtractorSettings
+
+# Document and extractor of the current worker process, created once by _init_worker.
+_doc: pymupdf.Document | None = None
+_extractor: BoundsExtractor | None = None
+
+
+def _init_worker(
+    source: str | bytes,
+    extractor_name: str,
+    borders: FourBorders,
+    settings: ExtractorSettings,
+) -> None:
+    global _doc, _extractor
+    logging.getLogger().setLevel(logging.WARNING)
+    if isinstance(source, bytes):
+        _doc = pymupdf.open(stream=source)
+    else:
+        _doc = pymupdf.open(source)
+    _extractor = get_bounds_extractor(extractor_name, borders, settings)
+
+
+def _get_chunk_bounds(pages: range, dpi: int | None) -> list[tuple[float, float, float, float] | None]:
+    assert _doc is not None and _extractor is not None
+    return [
+        tuple(rect) if rect is not None else None
+        for rect in _extractor.iter_raw_bounds(_doc, dpi, pages)
+    ]
+
+
+class ParallelBoundsExtractor(BoundsExtractor):
+    """
+    Runs a registered extractor in worker processes, each of which opens the
+    document once and extracts the bounds of contiguous chunks of pages.
+    The bounds are returned in page order.
+    """
+
+    def __init__(
+        self,
+        extractor_name: str,
+        borders: FourBorders,
+        settings: ExtractorSettings = ExtractorSettings(),
+        workers: int = 2,
+        chunk_size: int = 16,
+    ):
+        super().__init__(borders, settings)
+        self._extractor_name = extractor_name
+        self._borders = borders
+        self._workers = workers
+        self._chunk_size = chunk_size
+
+    @override
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
+        page_numbers = list(self._get_page_numbers(doc, pages))
+        chunks = self._get_chunks(page_numbers)
+        # Workers reopen unmodified documents from their file and get the bytes of others.
+        source: str | bytes = doc.name
+        if not doc.name or doc.is_dirty or not os.path.isfile(doc.name):
+            source = doc.tobytes()
+        # Progress is reported by this process, per chunk.
+        worker_settings = dataclasses.replace(self._settings, show_progress=False)
+        with (
+            ProcessPoolExecutor(
+                max_workers=min(self._workers, max(1, len(chunks))),
+                initializer=_init_worker,
+                initargs=(source, self._extractor_name, self._borders, worker_settings),
+            ) as executor,
+            tqdm(total=len(page_numbers), disable=not self._settings.show_progress) as progress,
+        ):
+            for chunk_bounds in executor.map(_get_chunk_bounds, chunks, [dpi] * len(chunks)):
+                progress.update(len(chunk_bounds))
+                for rect in chunk_bounds:
+                    yield pymupdf.Rect(rect) if rect is not None else None
+
+    def _get_chunks(self, page_numbers: list[int]) -> list[range]:
+        """Split the page numbers into runs of consecutive pages of at most ``chunk_size``."""
+        chunks: list[range] = []
+        start = 0
+        for i in range(1, len(page_numbers) + 1):
+            if (
+                i == len(page_numbers)
+                or page_numbers[i] != page_numbers[i - 1] + 1
+                or i - start == self._chunk_size
+            ):
+                chunks.append(range(page_numbers[start], page_numbers[i - 1] + 1))
+                start = i
+        return chunks
@@ -0,0 +1,230 @@
+import logging
+import math
+from abc import ABC
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import overload
+
+import numpy as np
+import pymupdf
+from tqdm import tqdm
+
+from borders import FourBorders
+from .background import get_background_estimator
+from .base import BoundsExtractor
+from .render_profiles import RenderProfile, get_render_profile
+from .settings import ExtractorSettings
+
+PDF_DPI = 72.0
+
+
+class RasterBoundsExtractor(BoundsExtractor, ABC):
+    """Base class for extractors that analyze rendered page images."""
+
+    keyed_settings = ("render_profile", "background_estimator", "max_megapixels")
+
+    def __init__(self, borders: FourBorders, settings: ExtractorSettings = ExtractorSettings()):
+        super().__init__(borders, settings)
+        self._render_profile = get_render_profile(settings.render_profile)
+        self._background_estimator = get_background_estimator(
+            settings.background_estimator,
+            self._render_profile.background_tolerance,
+        )
+        # Number of pixels rendered for each page of the last processed document.
+        self.pixels_rendered: list[int] = []
+        self._page_pixels = 0
+
+    def _iter_pages(
+        self, doc: pymupdf.Document, pages: Sequence[int] | None = None
+    ) -> Iterator[pymupdf.Page]:
+        """Iterate over the pages while recording how many pixels each one rendered."""
+        self.pixels_rendered = []
+        self._background_estimator.reset()
+        for i in tqdm(self._get_page_numbers(doc, pages), disable=not self._settings.show_progress):
+            self._page_pixels = 0
+            yield doc.load_page(i)
+            self.pixels_rendered.append(self._page_pixels)
+            logging.debug("Page %d: rendered %d pixels.", i, self._page_pixels)
+        if self.pixels_rendered:
+            logging.info(
+                "Rendered %.2f megapixels per page on average (%d pages).",
+                sum(self.pixels_rendered) / len(self.pixels_rendered) / 1e6,
+                len(self.pixels_rendered),
+            )
+
+    def _render_page(
+        self,
+        page: pymupdf.Page,
+        dpi: int | None,
+        clip: pymupdf.Rect | None = None,
+    ) -> pymupdf.Pixmap:
+        pix = render_page(page, dpi, self._render_profile, clip)
+        self._page_pixels += pix.width * pix.height
+        return pix
+
+    def _get_band_pixels(self) -> int | None:
+        """Maximum number of pixels rendered at once, or None to render whole pages."""
+        if self._settings.band_budget is None:
+            return None
+        return max(1, int(self._settings.band_budget * 1e6))
+
+    def _get_band_dpi(self, page: pymupdf.Page, max_dpi: int) -> int:
+        """Highest DPI up to ``max_dpi`` at which the whole page fits into one band."""
+        band_pixels = self._get_band_pixels()
+        if band_pixels is None:
+            return max_dpi
+        return min(max_dpi, self._get_fitting_dpi(page, band_pixels))
+
+    @overload
+    def _get_page_dpi(self, page: pymupdf.Page, dpi: int) -> int: ...
+    @overload
+    def _get_page_dpi(self, page: pymupdf.Page, dpi: int | None) -> int | None: ...
+    def _get_page_dpi(self, page: pymupdf.Page, dpi: int | None) -> int | None:
+        """
+        Render DPI of ``page``: the given ``dpi``, lowered to fit the page into
+        the pixel budget, or derived from the budget alone when ``dpi`` is unset.
+        """
+        if self._settings.max_megapixels is None:
+            return dpi
+        budget_dpi = self._get_fitting_dpi(page, int(self._settings.max_megapixels * 1e6))
+        return budget_dpi if dpi is None else min(dpi, budget_dpi)
+
+    @staticmethod
+    def _get_fitting_dpi(page: pymupdf.Page, pixels: int) -> int:
+        """Highest DPI at which the whole page renders into at most ``pixels`` pixels."""
+        area = page.rect.width * page.rect.height
+        return max(1, int(PDF_DPI * math.sqrt(pixels / area)))
+
+    @classmethod
+    def _get_page_size(cls, page: pymupdf.Page, dpi: int | None) -> pymupdf.IRect:
+        """Pixel rectangle of the whole page rendered at ``dpi``."""
+        return cls._get_pixel_rect(page.rect, dpi)
+
+    @classmethod
+    def _get_pixel_rect(cls, rect: pymupdf.Rect, dpi: int | None) -> pymupdf.IRect:
+        """Pixels covered by ``rect`` (in PDF points) when rendered at ``dpi``."""
+        zoom = 1 / cls._get_scale_factor(dpi)
+        return (rect * pymupdf.Matrix(zoom, zoom)).irect
+
+    @staticmethod
+    def _get_scale_factor(dpi: int | float | None) -> float:
+        """Size of one rendered pixel in PDF points."""
+        return PDF_DPI / dpi if dpi is not None else 1.0
+
+    def _analyze_pixmap(
+        self, pix: pymupdf.Pixmap
+    ) -> tuple[tuple[int, ...], tuple[int, int, int, int], tuple[int, int, int, int] | None]:
+        """Return the dominant color, border cuts and content edges of a pixmap."""
+        pixels = self._pixmap_to_array(pix)
+        dominant_color = self._background_estimator.estimate(pixels)
+        background = self._get_background_mask(
+            pixels,
+            (pix.width, pix.height),
+            dominant_color,
+            self._render_profile.background_tolerance,
+        )
+        cuts = self._get_mask_border_cuts(background)
+        return dominant_color, cuts, self._get_content_edges(background, cuts)
+
+    @staticmethod
+    def _pixmap_to_array(pix: pymupdf.Pixmap) -> np.ndarray:
+        """View the pixmap samples as a (height, width, channels) array without copying."""
+        samples = np.frombuffer(pix.samples_mv, dtype=np.uint8)  # type: ignore[arg-type]
+        rows = samples.reshape(pix.height, pix.stride)
+        return rows[:, : pix.width * pix.n].reshape(pix.height, pix.width, pix.n)
+
+    @staticmethod
+    def _get_background_mask(
+        pixels: np.ndarray | Sequence[tuple[int, ...]],
+        img_size: tuple[int, int],
+        color: tuple[int, ...],
+        tolerance: int = 0,
+    ) -> np.ndarray:
+        """
+        Return a (height, width) boolean mask of the pixels whose channels all
+        differ from ``color`` by at most ``tolerance``.
+        """
+        width, height = img_size
+        array = np.asarray(pixels, dtype=np.uint8).reshape(height, width, -1)
+        if tolerance == 0:
+            return np.all(array == np.asarray(color, dtype=np.uint8), axis=2)
+        difference = np.abs(array.astype(np.int16) - np.asarray(color, dtype=np.int16))
+        return np.all(difference <= tolerance, axis=2)
+
+    def _get_content_edges(
+        self,
+        background: np.ndarray,
+        cuts: tuple[int, int, int, int],
+    ) -> tuple[int, int, int, int] | None:
+        """
+        Return the (left, top, right, bottom) pixel indices of the outermost
+        non-background pixels inside the border cuts, or None for empty pages.
+        """
+        height, width = background.shape
+        left_cut, top_cut, right_cut, bottom_cut = cuts
+        content = ~background[top_cut : height - bottom_cut, left_cut : width - right_cut]
+        content_columns = content.any(axis=0)
+        if not content_columns.any():
+            return None
+        content_rows = content.any(axis=1)
+        left = left_cut + self._leading_run(~content_columns)
+        right = left_cut + content_columns.size - 1 - self._leading_run(~content_columns[::-1])
+        top = top_cut + self._leading_run(~content_rows)
+        bottom = top_cut + content_rows.size - 1 - self._leading_run(~content_rows[::-1])
+        return left, top, right, bottom
+
+    def _get_mask_border_cuts(self, background: np.ndarray) -> tuple[int, int, int, int]:
+        """
+        Count the uniform border lines (rows/columns without a single background
+        pixel) on each side of the image, returned as (left, top, right, bottom).
+        """
+        height, width = background.shape
+        columns_without_background = ~background.any(axis=0)
+        left = self._leading_run(columns_without_background)
+        right = self._leading_run(columns_without_background[left:][::-1])
+        if left > width - 1 - right:
+            return left, 0, right, 0
+
+        rows_without_background = ~background[:, left : width - right].any(axis=1)
+        top = self._leading_run(rows_without_background)
+        bottom = self._leading_run(rows_without_background[top:][::-1])
+        return left, top, right, bottom
+
+    @staticmethod
+    def _leading_run(flags: np.ndarray) -> int:
+        """Number of consecutive True values at the start of a 1-D boolean array."""
+        if flags.all():
+            return int(flags.size)
+        return int(flags.argmin())
+
+
+def render_page(
+    page: pymupdf.Page,
+    dpi: int | None,
+    profile: RenderProfile,
+    clip: pymupdf.Rect | None = None,
+) -> pymupdf.Pixmap:
+    with _antialiasing(profile.antialias):
+        return page.get_pixmap(  # type: ignore[no-any-return]
+            dpi=dpi,
+            colorspace=profile.colorspace,
+            alpha=profile.alpha,
+            annots=profile.annots,
+            clip=clip,
+        )
+
+
+@contextmanager
+def _antialiasing(enabled: bool) -> Iterator[None]:
+    # The anti-aliasing level is global MuPDF state, so restore it after rendering.
+    if enabled:
+        yield
+        return
+    previous = pymupdf.TOOLS.show_aa_level()
+    pymupdf.TOOLS.set_aa_level(0)
+    try:
+        yield
+    finally:
+        # set_aa_level sets both levels, so restore them one by one.
+        pymupdf.mupdf.fz_set_graphics_aa_level(previous["graphics"])
+        pymupdf.mupdf.fz_set_text_aa_level(previous["text"])
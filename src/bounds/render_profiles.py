@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+
+import pymupdf
+
+
+@dataclass(frozen=True, slots=True)
+class RenderProfile:
+    """Pixmap settings used by the raster-based bounds extractors."""
+
+    colorspace: pymupdf.Colorspace
+    alpha: bool
+    antialias: bool
+    annots: bool
+    # Maximum per-channel difference for a pixel to still count as background.
+    background_tolerance: int
+
+
+RENDER_PROFILE_MAPPING: dict[str, RenderProfile] = {
+    "default": RenderProfile(
+        colorspace=pymupdf.csRGB,
+        alpha=False,
+        antialias=True,
+        annots=True,
+        background_tolerance=0,
+    ),
+    # One byte per pixel and no anti-aliased edges; the tolerance absorbs paper
+    # noise that would otherwise be split into several near-background shades.
+    "fast": RenderProfile(
+        colorspace=pymupdf.csGRAY,
+        alpha=False,
+        antialias=False,
+        annots=False,
+        background_tolerance=8,
+    ),
+}
+
+
+def get_render_profile(name: str) -> RenderProfile:
+    try:
+        return RENDER_PROFILE_MAPPING[name]
+    except KeyError:
+        raise ValueError(f"Unknown render profile: {name!r}")
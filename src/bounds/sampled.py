@@ -0,0 +1,167 @@
+import logging
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from typing import override
+
+import numpy as np
+import pymupdf
+
+from borders import FourBorders
+from .base import BoundsExtractor, ExtractionRun
+from .bbox_bounds import BBoxBoundsExtractor
+
+# Quantile of the painted areas of the sample used for each side of a group's
+# area, so a few unusual pages in the sample (a full-bleed figure, a title page)
+# do not widen it; such pages are then extracted on their own.
+SAMPLE_QUANTILE = 0.1
+# How far (in PDF points) the painted area of a page may extend past its group's
+# area before the page is extracted on its own.
+CHECK_TOLERANCE = 2.0
+
+
+class SampledBoundsExtractor(BoundsExtractor):
+    """
+    For documents with the same margins on every page: runs the wrapped
+    extractor on an evenly spread sample of the odd and of the even pages and
+    gives every page of a group the group's bounds. Each page is checked
+    cheaply with the render-free ``bbox`` extractor; pages of another size than
+    most of their group, or whose painted area reaches past the one of the
+    sample, are extracted on their own. Scans have no painted area to check:
+    their groups get the union of the bounds of their sample.
+    """
+
+    def __init__(self, extractor: BoundsExtractor, borders: FourBorders, sample_size: int = 16):
+        super().__init__(borders)
+        self._extractor = extractor
+        self._checker = BBoxBoundsExtractor(borders)
+        self._sample_size = sample_size
+
+    @override
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
+        page_numbers = list(self._get_page_numbers(doc, pages))
+        sizes = {n: self._get_size(doc[n].bound()) for n in page_numbers}
+        checks = dict(zip(page_numbers, self._checker.iter_raw_bounds(doc, None, page_numbers)))
+
+        # Pages extracted on their own, and the group each other page belongs to.
+        single: set[int] = set()
+        groups: dict[int, list[int]] = {}
+        for parity in (0, 1):
+            members = [n for n in dict.fromkeys(page_numbers) if n % 2 == parity]
+            if not members:
+                continue
+            size, _ = Counter(sizes[n] for n in members).most_common(1)[0]
+            single.update(n for n in members if sizes[n] != size)
+            groups[parity] = [n for n in members if sizes[n] == size]
+
+        samples = {parity: self._get_sample(members) for parity, members in groups.items()}
+        sampled = sorted(set().union(*samples.values()))
+        extracted = dict(zip(sampled, list(self._extractor.iter_raw_bounds(doc, dpi, sampled))))
+
+        group_bounds: dict[int, pymupdf.Rect | None] = {}
+        for parity, members in groups.items():
+            group_check = self._get_quantile_rect([checks[n] for n in samples[parity]])
+            group_bounds[parity] = self._get_group_bounds(
+                group_check, [(extracted[n], checks[n]) for n in samples[parity]]
+            )
+            if group_bounds[parity] is None:
+                # Nothing to give the group's pages; rather than the full page, extract them.
+                single.update(members)
+            single.update(
+                n
+                for n in members
+                if n not in extracted and not self._agrees(checks[n], group_check)
+            )
+
+        single_pages = sorted(single - set(extracted))
+        logging.info(
+            "Sampled bounds: extracted %d of %d pages (%d sampled, %d differing from their group).",
+            len(sampled) + len(single_pages),
+            len(page_numbers),
+            len(sampled),
+            len(single_pages),
+        )
+        with ExtractionRun(self._extractor, doc, dpi, single_pages) as extracted_single:
+            for page_number in page_numbers:
+                if page_number not in extracted and page_number in single:
+                    extracted[page_number] = next(extracted_single)
+                if page_number in extracted:
+                    bounds = extracted[page_number]
+                else:
+                    bounds = group_bounds[page_number % 2]
+                yield pymupdf.Rect(bounds) if bounds is not None else None
+
+    @staticmethod
+    def _get_size(rect: pymupdf.Rect) -> tuple[float, float]:
+        return round(rect.width, 1), round(rect.height, 1)
+
+    def _get_sample(self, members: list[int]) -> list[int]:
+        """The middle page of each of ``sample_size`` equal runs of the group."""
+        if len(members) <= self._sample_size:
+            return members
+        step = len(members) / self._sample_size
+        return [members[int((i + 0.5) * step)] for i in range(self._sample_size)]
+
+    @staticmethod
+    def _get_quantile_rect(rects: list[pymupdf.Rect | None]) -> pymupdf.Rect | None:
+        """Bounds covering all but the outermost ``SAMPLE_QUANTILE`` of ``rects`` on each side."""
+        coordinates = np.array([tuple(rect) for rect in rects if rect is not None], dtype=np.float64)
+        if coordinates.size == 0:
+            return None
+        x0, y0 = np.quantile(coordinates[:, :2], SAMPLE_QUANTILE, axis=0)
+        x1, y1 = np.quantile(coordinates[:, 2:], 1 - SAMPLE_QUANTILE, axis=0)
+        return pymupdf.Rect(x0, y0, x1, y1)
+
+    @staticmethod
+    def _get_group_bounds(
+        group_check: pymupdf.Rect | None,
+        sample: list[tuple[pymupdf.Rect | None, pymupdf.Rect | None]],
+    ) -> pymupdf.Rect | None:
+        """
+        The group's painted area moved out by the tolerance and by the largest
+        distance by which the extracted bounds of a sampled page reach past its
+        painted area, so that they cover every page that agrees with the group.
+        Without a painted area, as on scans whose only content is a full-page
+        image, the union of the extracted bounds of the sample; None if they are
+        all empty.
+        """
+        if group_check is None:
+            extracted = [bounds for bounds, _ in sample if bounds is not None]
+            if not extracted:
+                return None
+            union = pymupdf.Rect(extracted[0])
+            for bounds in extracted[1:]:
+                union |= bounds
+            return union
+        # Per sampled page, the sides of its bounds minus the sides of its painted area.
+        differences = np.array(
+            [
+                np.subtract(tuple(bounds), tuple(check))
+                for bounds, check in sample
+                if bounds is not None and check is not None
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        if differences.size == 0:
+            return None
+        # Pages may reach past the group's painted area by the tolerance.
+        return pymupdf.Rect(
+            group_check.x0 - CHECK_TOLERANCE + differences[:, 0].min(),
+            group_check.y0 - CHECK_TOLERANCE + differences[:, 1].min(),
+            group_check.x1 + CHECK_TOLERANCE + differences[:, 2].max(),
+            group_check.y1 + CHECK_TOLERANCE + differences[:, 3].max(),
+        )
+
+    @staticmethod
+    def _agrees(check: pymupdf.Rect | None, group_check: pymupdf.Rect | None) -> bool:
+        """Whether the painted area of a page lies within its group's; blank pages agree."""
+        if check is None:
+            return True
+        if group_check is None:
+            return False
+        allowed = group_check + (-CHECK_TOLERANCE, -CHECK_TOLERANCE, CHECK_TOLERANCE, CHECK_TOLERANCE)
+        return allowed.contains(check)
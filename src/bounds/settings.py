@@ -0,0 +1,31 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class ExtractorSettings:
+    """Extraction options; extractors ignore the ones that do not apply to them."""
+
+    render_profile: str = "default"
+    # Find approximate bounds at a low DPI and refine only the edges at full DPI.
+    multi_resolution: bool = False
+    # How the background color of rendered pages is estimated.
+    background_estimator: str = "full"
+    # Render pages in bands of at most this many megapixels instead of whole.
+    band_budget: float | None = None
+    # Lower (or, when no DPI is given, derive) each page's DPI to fit this many megapixels.
+    max_megapixels: float | None = None
+    # Engine used by the OCR extractor to find words.
+    ocr_backend: str = "pytesseract"
+    # OCR only the content left after trimming the background in a cheap raster pass.
+    ocr_trim: bool = False
+    # Render OCR images at the DPI that gives the text this x-height in pixels.
+    ocr_x_height: int | None = None
+    # Number of worker processes running OCR while pages are rendered; 1 runs it in-process.
+    ocr_workers: int = 1
+    # Show a progress bar over the pages of the document.
+    show_progress: bool = True
+
+    def get_keyed(self, names: Iterable[str]) -> dict:
+        """The settings ``names`` (see ``BoundsExtractor.keyed_settings``) as a dictionary."""
+        return {name: getattr(self, name) for name in names}
@@ -0,0 +1,179 @@
+import json
+import math
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import override
+
+import numpy as np
+import pymupdf
+
+from borders import FourBorders
+from .base import BoundsExtractor
+from .factory import get_keyed_settings
+from .settings import ExtractorSettings
+
+SIDECAR_VERSION = 1
+# Difference in page size (in PDF points) still accepted when cropping from a sidecar.
+PAGE_SIZE_TOLERANCE = 0.01
+
+
+@dataclass(frozen=True)
+class BoundsSidecar:
+    """
+    Raw page bounds (before the borders are added, None for pages without
+    content) together with the page sizes and how the bounds were extracted.
+    """
+
+    # Name of the bounds extractor.
+    extractor: str
+    # DPI the bounds were extracted at.
+    dpi: int | None
+    # Settings that change the bounds of the extractor, as a dictionary of ExtractorSettings
+    # fields; manifests also hold the options of the extractors wrapping it.
+    settings: dict = field(default_factory=dict)
+    # (width, height) of each page, in PDF points.
+    page_sizes: list[tuple[float, float]] = field(default_factory=list)
+    # Raw bounds of each page.
+    bounds: list[pymupdf.Rect | None] = field(default_factory=list)
+    # Content digest of each page (see PageDigester), or empty if not recorded.
+    digests: list[str] = field(default_factory=list)
+
+    @classmethod
+    def create(
+        cls,
+        doc: pymupdf.Document,
+        bounds: Sequence[pymupdf.Rect | None],
+        extractor: str,
+        dpi: int | None,
+        settings: ExtractorSettings,
+        digests: Sequence[str] = (),
+    ) -> "BoundsSidecar":
+        return cls(
+            extractor=extractor,
+            dpi=dpi,
+            settings=get_keyed_settings(extractor, settings),
+            page_sizes=[(page.rect.width, page.rect.height) for page in doc],
+            bounds=list(bounds),
+            digests=list(digests),
+        )
+
+    def has_same_extraction(
+        self,
+        extractor: str,
+        dpi: int | None,
+        settings: ExtractorSettings,
+        options: dict | None = None,
+    ) -> bool:
+        """Whether the bounds were extracted with this extractor, DPI, settings and wrapper ``options``."""
+        return (self.extractor, self.dpi, self.settings) == (
+            extractor,
+            dpi,
+            {**get_keyed_settings(extractor, settings), **(options or {})},
+        )
+
+
+def save_sidecar(sidecar: BoundsSidecar, path: Path) -> None:
+    """Write the sidecar as JSON (``.json``) or as NumPy arrays (``.npz``)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    metadata = {
+        "version": SIDECAR_VERSION,
+        "extractor": sidecar.extractor,
+        "dpi": sidecar.dpi,
+        "settings": sidecar.settings,
+    }
+    if path.suffix == ".json":
+        pages = [
+            {"size": list(size), "bounds": list(rect) if rect is not None else None}
+            for size, rect in zip(sidecar.page_sizes, sidecar.bounds)
+        ]
+        for page, digest in zip(pages, sidecar.digests):
+            page["digest"] = digest
+        # One line per page keeps the file short and easy to fix by hand.
+        header = json.dumps(metadata, indent=1)[: -len("\n}")]
+        lines = ",\n".join(f"  {json.dumps(page)}" for page in pages)
+        path.write_text(f'{header},\n "pages": [\n{lines}\n ]\n}}\n')
+    elif path.suffix == ".npz":
+        # Pages without content are rows of NaN.
+        bounds = np.array(
+            [tuple(rect) if rect is not None else (np.nan,) * 4 for rect in sidecar.bounds],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        page_sizes = np.array(sidecar.page_sizes, dtype=np.float64).reshape(-1, 2)
+        np.savez_compressed(
+            path,
+            bounds=bounds,
+            page_sizes=page_sizes,
+            digests=np.array(sidecar.digests, dtype=str),
+            metadata=np.array(json.dumps(metadata)),
+        )
+    else:
+        raise ValueError(f"Unknown sidecar format: {path.suffix!r}")
+
+
+def load_sidecar(path: Path) -> BoundsSidecar:
+    if path.suffix == ".json":
+        data = json.loads(path.read_text())
+        page_sizes = [tuple(page["size"]) for page in data["pages"]]
+        bounds = [
+            pymupdf.Rect(page["bounds"]) if page["bounds"] is not None else None
+            for page in data["pages"]
+        ]
+        digests = [page["digest"] for page in data["pages"] if "digest" in page]
+    elif path.suffix == ".npz":
+        with np.load(path, allow_pickle=False) as arrays:
+            data = json.loads(str(arrays["metadata"]))
+            page_sizes = [tuple(size) for size in arrays["page_sizes"].tolist()]
+            bounds = [
+                pymupdf.Rect(row) if not math.isnan(row[0]) else None
+                for row in arrays["bounds"].tolist()
+            ]
+            digests = arrays["digests"].tolist() if "digests" in arrays else []
+    else:
+        raise ValueError(f"Unknown sidecar format: {path.suffix!r}")
+    if data["version"] != SIDECAR_VERSION:
+        raise ValueError(f"Unsupported sidecar version: {data['version']!r}")
+    if digests and len(digests) != len(bounds):
+        raise ValueError(f"The sidecar has digests of {len(digests)} of its {len(bounds)} pages.")
+    return BoundsSidecar(
+        extractor=data["extractor"],
+        dpi=data["dpi"],
+        settings=data["settings"],
+        page_sizes=page_sizes,
+        bounds=bounds,
+        digests=digests,
+    )
+
+
+class SidecarBoundsExtractor(BoundsExtractor):
+    """Yields the raw bounds stored in a sidecar instead of extracting them."""
+
+    def __init__(self, sidecar: BoundsSidecar, borders: FourBorders):
+        super().__init__(borders)
+        self._sidecar = sidecar
+
+    @override
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
+        _ = dpi
+        if len(self._sidecar.bounds) != doc.page_count:
+            raise ValueError(
+                f"The sidecar has bounds of {len(self._sidecar.bounds)} pages, "
+                f"but the document has {doc.page_count} pages."
+            )
+        for page in self._iter_doc_pages(doc, pages):
+            width, height = self._sidecar.page_sizes[page.number]
+            if not (
+                math.isclose(width, page.rect.width, abs_tol=PAGE_SIZE_TOLERANCE)
+                and math.isclose(height, page.rect.height, abs_tol=PAGE_SIZE_TOLERANCE)
+            ):
+                raise ValueError(
+                    f"Page {page.number} is {page.rect.width:g}x{page.rect.height:g} points, "
+                    f"but {width:g}x{height:g} in the sidecar."
+                )
+            rect = self._sidecar.bounds[page.number]
+            yield pymupdf.Rect(rect) if rect is not None else None
@@ -0,0 +1,43 @@
+from collections.abc import Container, Iterator, Sequence
+
+import pymupdf
+
+from borders import BorderSpec, BorderUnit, FourBorders
+from bounds.base import BoundsExtractor
+
+
+def make_doc(page_count: int, height: float = 200, blank: Container[int] = ()) -> pymupdf.Document:
+    """A document with a line of text at another place on each page but the ``blank`` ones."""
+    doc = pymupdf.open()
+    for i in range(page_count):
+        page = doc.new_page(width=200, height=height)
+        if i not in blank:
+            page.insert_text((20 + 10 * i, 40 + 10 * i), f"Page {i}", fontsize=10)
+    return doc
+
+
+def no_borders() -> FourBorders:
+    return point_borders(0)
+
+
+def point_borders(points: float) -> FourBorders:
+    border = BorderSpec(points, BorderUnit.POINT)
+    return FourBorders(border, border, border, border)
+
+
+class CountingExtractor(BoundsExtractor):
+    """Wraps an extractor and records the pages it is asked for."""
+
+    def __init__(self, extractor: BoundsExtractor):
+        super().__init__(no_borders())
+        self._extractor = extractor
+        self.pages: list[int] = []
+
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
+        self.pages.extend(self._get_page_numbers(doc, pages))
+        return self._extractor.iter_raw_bounds(doc, dpi, pages)
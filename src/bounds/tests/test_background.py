@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from bounds import background
+from bounds.background import (FullCountBackgroundEstimator,
+                               SampledBackgroundEstimator,
+                               get_dominant_color)
+
+
+class DominantColorTests(unittest.TestCase):
+    def test_dominant_color_is_most_frequent_pixel(self) -> None:
+        pixels = np.full((4, 5, 3), 255, dtype=np.uint8)
+        pixels[0, :3] = (10, 20, 30)
+
+        self.assertEqual(get_dominant_color(pixels), (255, 255, 255))
+
+    def test_dominant_color_of_grayscale_pixels(self) -> None:
+        pixels = np.zeros((4, 5, 1), dtype=np.uint8)
+        pixels[:3] = 200
+
+        self.assertEqual(get_dominant_color(pixels), (200,))
+
+
+class SampledBackgroundEstimatorTests(unittest.TestCase):
+    def _page(self, color: tuple[int, int, int], content_rows: int = 0) -> np.ndarray:
+        pixels = np.full((200, 150, 3), color, dtype=np.uint8)
+        pixels[:content_rows] = (0, 0, 0)
+        return pixels
+
+    def test_matches_full_count(self) -> None:
+        pixels = self._page((250, 245, 240), content_rows=40)
+
+        self.assertEqual(
+            SampledBackgroundEstimator().estimate(pixels),
+            FullCountBackgroundEstimator().estimate(pixels),
+        )
+
+    def test_reuses_prior_without_counting(self) -> None:
+        estimator = SampledBackgroundEstimator()
+        estimator.estimate(self._page((255, 255, 255)))
+
+        with mock.patch.object(background, "get_dominant_color") as dominant_color:
+            color = estimator.estimate(self._page((255, 255, 255), content_rows=60))
+        self.assertEqual(color, (255, 255, 255))
+        dominant_color.assert_not_called()
+
+    def test_replaces_prior_when_background_changes(self) -> None:
+        estimator = SampledBackgroundEstimator()
+        estimator.estimate(self._page((255, 255, 255)))
+
+        self.assertEqual(estimator.estimate(self._page((230, 220, 200))), (230, 220, 200))
+
+    def test_falls_back_to_full_count_for_inconclusive_sample(self) -> None:
+        pixels = np.zeros((256, 256, 1), dtype=np.uint8)
+        pixels[:, :100] = 255
+        pixels[:, 100:190] = 128
+
+        with mock.patch.object(
+            background, "get_dominant_color", wraps=get_dominant_color
+        ) as dominant_color:
+            color = SampledBackgroundEstimator().estimate(pixels)
+        self.assertEqual(color, (255,))
+        self.assertEqual(dominant_color.call_count, 2)
+        self.assertEqual(dominant_color.call_args.args[0].shape, pixels.shape)
+
+
+if __name__ == "__main__":
+    unittest.main()
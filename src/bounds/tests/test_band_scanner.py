@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+import pymupdf
+
+from borders import BorderSpec, BorderUnit, FourBorders
+from bounds.band_scanner import BandScanner
+from bounds.histogram_bounds import HistogramBoundsExtractor
+
+
+class BandScannerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        zero = BorderSpec(0.0, BorderUnit.POINT)
+        self.extractor = HistogramBoundsExtractor(FourBorders(zero, zero, zero, zero))
+        self.rendered: list[pymupdf.IRect] = []
+
+    def _scanner(self, background: np.ndarray, band_pixels: int) -> BandScanner:
+        def render_background(band: pymupdf.IRect) -> np.ndarray:
+            self.rendered.append(band)
+            return background[band.y0 : band.y1, band.x0 : band.x1]
+
+        return BandScanner(render_background, band_pixels)
+
+    def _full_scan(self, background: np.ndarray):
+        cuts = self.extractor._get_mask_border_cuts(background)
+        return cuts, self.extractor._get_content_edges(background, cuts)
+
+    def test_matches_full_page_scan(self) -> None:
+        rng = np.random.default_rng(7)
+        for _ in range(300):
+            height, width = rng.integers(1, 40, size=2)
+            background = np.ones((height, width), dtype=bool)
+            for _ in range(rng.integers(0, 3)):
+                background[:, : rng.integers(0, 4)] = False
+                background[: rng.integers(0, 4), :] = False
+                background[height - rng.integers(0, 4) :, :] = False
+                background[:, width - rng.integers(0, 4) :] = False
+            for _ in range(rng.integers(0, 6)):
+                background[rng.integers(height), rng.integers(width)] = False
+
+            for band_pixels in (1, 17, 10_000):
+                scanner = self._scanner(background, band_pixels)
+                self.assertEqual(scanner.scan(width, height), self._full_scan(background))
+
+    def test_bands_respect_budget_and_stop_at_content(self) -> None:
+        width, height = 200, 300
+        background = np.ones((height, width), dtype=bool)
+        background[20:280:5, 15:185] = False
+
+        scanner = self._scanner(background, band_pixels=2_000)
+        self.assertEqual(scanner.scan(width, height), ((0, 0, 0, 0), (15, 20, 184, 275)))
+        self.assertTrue(all(band.width * band.height <= 2_000 for band in self.rendered))
+        self.assertLess(sum(band.width * band.height for band in self.rendered), width * height)
+
+
+if __name__ == "__main__":
+    unittest.main()
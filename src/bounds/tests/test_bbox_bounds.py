@@ -0,0 +1,34 @@
+import unittest
+
+import pymupdf
+
+from bounds.bbox_bounds import BBoxBoundsExtractor
+from helpers import no_borders
+
+
+class BBoxBoundsTests(unittest.TestCase):
+    def test_bounds_visible_content_only(self) -> None:
+        doc = pymupdf.open()
+        page = doc.new_page(width=300, height=300)
+        page.draw_rect(page.rect, color=None, fill=(1, 1, 1))
+        page.insert_text((100, 100), "text", fontsize=10)
+        page.insert_text((10, 10), "invisible", fontsize=10, render_mode=3)
+        page.draw_line((100, 150), (200, 150), width=1)
+        xref = page.get_contents()[0]
+        # blue square at (150, 50)-(250, 150) clipped to (200, 80)-(220, 100) in page coordinates
+        clipped = b"\nq 200 200 20 20 re W n 0 0 1 rg 150 150 100 100 re f Q\n"
+        doc.update_stream(xref, doc.xref_stream(xref) + clipped)
+        doc.new_page(width=300, height=300)
+
+        rectangles = BBoxBoundsExtractor(no_borders()).get_bounds(doc, None)
+
+        text = pymupdf.Rect(doc[0].get_text("blocks")[0][:4])
+        self.assertAlmostEqual(rectangles[0].x0, text.x0, delta=1)
+        self.assertAlmostEqual(rectangles[0].y0, 80, delta=1e-3)
+        self.assertAlmostEqual(rectangles[0].x1, 220, delta=1e-3)
+        self.assertAlmostEqual(rectangles[0].y1, 150.5, delta=1e-3)
+        self.assertEqual(rectangles[1], doc[1].rect)
+
+
+if __name__ == "__main__":
+    unittest.main()
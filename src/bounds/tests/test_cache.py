@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pymupdf
+
+from borders import FourBorders
+from bounds.cache import BoundsCache, CachedBoundsExtractor
+from bounds.digest import PageDigester
+from bounds.factory import get_bounds_extractor
+from bounds.settings import ExtractorSettings
+from helpers import CountingExtractor, make_doc, no_borders, point_borders
+
+
+class BoundsCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "bounds.sqlite"
+
+    def _get_extractor(
+        self,
+        borders: FourBorders,
+        runs: list[CountingExtractor],
+        settings: ExtractorSettings = ExtractorSettings(),
+    ) -> CachedBoundsExtractor:
+        counting = CountingExtractor(get_bounds_extractor("text_page", no_borders()))
+        runs.append(counting)
+        cache = BoundsCache(self.path)
+        self.addCleanup(cache.close)
+        return CachedBoundsExtractor(counting, "text_page", cache, borders, settings)
+
+    def test_second_run_reads_cache_and_applies_new_borders(self) -> None:
+        doc = make_doc(4, blank=(2,))
+        runs: list[CountingExtractor] = []
+        first = self._get_extractor(no_borders(), runs).get_bounds(doc, None)
+        second = self._get_extractor(point_borders(5), runs).get_bounds(doc, None)
+
+        expected = get_bounds_extractor("text_page", point_borders(5)).get_bounds(doc, None)
+
+        self.assertEqual(runs[0].pages, [0, 1, 2, 3])
+        self.assertEqual(runs[1].pages, [])
+        self.assertEqual(second, expected)
+        self.assertNotEqual(first, second)
+        # the empty page is cached as empty and still gets the whole page
+        self.assertEqual(second[2], pymupdf.Rect(0, 0, 200, 200))
+
+    def test_changed_page_is_extracted_again(self) -> None:
+        doc = make_doc(4, blank=(2,))
+        runs: list[CountingExtractor] = []
+        self._get_extractor(no_borders(), runs).get_bounds(doc, None)
+        doc[1].insert_text((150, 150), "New", fontsize=10)
+
+        bounds = self._get_extractor(no_borders(), runs).get_bounds(doc, None)
+
+        self.assertEqual(runs[1].pages, [1])
+        self.assertGreater(bounds[1].x1, 150)
+
+    def test_settings_the_extractor_ignores_keep_the_cache(self) -> None:
+        doc = make_doc(4, blank=(2,))
+        runs: list[CountingExtractor] = []
+        self._get_extractor(no_borders(), runs).get_bounds(doc, None)
+        raster_settings = ExtractorSettings(render_profile="fast", band_budget=1.0, ocr_trim=True)
+
+        self._get_extractor(no_borders(), runs, raster_settings).get_bounds(doc, None)
+
+        self.assertEqual(runs[1].pages, [])
+
+    def test_evicts_least_recently_used_entries(self) -> None:
+        cache = BoundsCache(self.path, max_bytes=64 * 1024)
+        for i in range(5000):
+            cache.put("config", f"page {i}", pymupdf.Rect(i, i, i + 1, i + 1))
+
+        evicted = cache.evict()
+
+        self.assertGreater(evicted, 0)
+        self.assertEqual(cache.get_many("config", ["page 0"]), {})
+        self.assertIn("page 4999", cache.get_many("config", ["page 4999"]))
+        cache.close()
+
+
+class PageDigesterTests(unittest.TestCase):
+    def test_identical_pages_share_digest_across_documents(self) -> None:
+        doc = make_doc(4, blank=(2,))
+        copy = pymupdf.open()
+        copy.new_page()
+        copy.insert_pdf(doc, from_page=1, to_page=1)
+        copy = pymupdf.open(stream=copy.tobytes(garbage=4))
+
+        digest = PageDigester(doc).get_digest(1)
+
+        self.assertEqual(PageDigester(copy).get_digest(1), digest)
+        self.assertNotEqual(PageDigester(doc).get_digest(0), digest)
+
+    def test_rotation_changes_digest(self) -> None:
+        doc = make_doc(4, blank=(2,))
+        digest = PageDigester(doc).get_digest(0)
+        doc[0].set_rotation(90)
+
+        self.assertNotEqual(PageDigester(doc).get_digest(0), digest)
+
+
+if __name__ == "__main__":
+    unittest.main()
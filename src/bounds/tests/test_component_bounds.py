@@ -0,0 +1,34 @@
+import unittest
+
+import pymupdf
+
+from bounds.component_bounds import ComponentBoundsExtractor
+from helpers import no_borders
+
+
+class ComponentBoundsTests(unittest.TestCase):
+    def test_ignores_noise_around_text(self) -> None:
+        doc = pymupdf.open()
+        page = doc.new_page(width=400, height=400)
+        page.insert_text((100, 150), "Some text", fontsize=12)
+        page.insert_text((100, 250), "more text", fontsize=12)
+        black = (0, 0, 0)
+        # scanner speck, punch hole, rule and page-edge shadow
+        page.draw_rect(pymupdf.Rect(30, 30, 31, 31), color=None, fill=black)
+        page.draw_circle((30, 200), 9, color=black, fill=black)
+        page.draw_rect(pymupdf.Rect(50, 320, 350, 321), color=black, fill=black)
+        page.draw_rect(pymupdf.Rect(390, 50, 400, 100), color=black, fill=black)
+        doc.new_page(width=400, height=400)
+
+        rectangles = ComponentBoundsExtractor(no_borders()).get_bounds(doc, None)
+
+        blocks = doc[0].get_text("blocks")
+        text = pymupdf.Rect(blocks[0][:4]) | pymupdf.Rect(blocks[1][:4])
+        self.assertTrue(rectangles[0] in text + (-1, -1, 1, 1))
+        self.assertLess(abs(rectangles[0].x0 - text.x0), 2)
+        self.assertLess(abs(rectangles[0].y1 - text.y1), 5)
+        self.assertEqual(rectangles[1], doc[1].rect)
+
+
+if __name__ == "__main__":
+    unittest.main()
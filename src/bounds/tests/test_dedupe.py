@@ -0,0 +1,31 @@
+import unittest
+
+import pymupdf
+
+from bounds.dedupe import DeduplicatingBoundsExtractor
+from bounds.factory import get_bounds_extractor
+from helpers import CountingExtractor, no_borders
+
+
+class DeduplicatingBoundsTests(unittest.TestCase):
+    def test_identical_pages_are_extracted_once(self) -> None:
+        doc = pymupdf.open()
+        for text in ["Form", None, "Chapter", "Form", None, "Form"]:
+            page = doc.new_page(width=200, height=200)
+            if text is not None:
+                page.insert_text((30, 60), text, fontsize=12)
+        # Pages inserted from a copy have their own objects but the same content.
+        doc.insert_pdf(pymupdf.open(stream=doc.tobytes()), from_page=2, to_page=2)
+        inner = get_bounds_extractor("text_page", no_borders())
+        counting = CountingExtractor(inner)
+
+        with self.assertLogs(level="INFO") as logs:
+            bounds = DeduplicatingBoundsExtractor(counting, no_borders()).get_bounds(doc, None)
+
+        self.assertEqual(counting.pages, [0, 1, 2])
+        self.assertEqual(bounds, inner.get_bounds(doc, None))
+        self.assertIn("4 of 7 pages", logs.output[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from src.borders import BorderSpec, BorderUnit, FourBorders
 from src.bounds.histogram_bounds import HistogramBoundsExtractor
 
@@ -104,5 +106,42 @@ class HistogramBoundsExtractorBorderTests(unittest.TestCase):
         self.assertEqual(cuts, (1, 1, 1, 1))
 
 
+class HistogramBoundsExtractorContentTests(unittest.TestCase):
+    def setUp(self) -> None:
+        zero = BorderSpec(0.0, BorderUnit.POINT)
+        self.extractor = HistogramBoundsExtractor(FourBorders(zero, zero, zero, zero))
+        self.bg = (255, 255, 255)
+
+    def test_content_edges_inside_border_cuts(self) -> None:
+        width, height = 10, 8
+        pixels = np.full((height, width, 3), self.bg, dtype=np.uint8)
+        pixels[0, :] = (0, 0, 0)
+        pixels[2, 4] = (0, 0, 0)
+        pixels[5, 7] = (0, 0, 0)
+        background = self.extractor._get_background_mask(pixels, (width, height), self.bg)
+
+        cuts = self.extractor._get_mask_border_cuts(background)
+        edges = self.extractor._get_content_edges(background, cuts)
+        self.assertEqual(cuts, (0, 1, 0, 0))
+        self.assertEqual(edges, (4, 2, 7, 5))
+
+    def test_background_mask_with_tolerance(self) -> None:
+        width, height = 3, 1
+        pixels = np.array([[[250], [245], [200]]], dtype=np.uint8)
+
+        exact = self.extractor._get_background_mask(pixels, (width, height), (250,))
+        tolerant = self.extractor._get_background_mask(pixels, (width, height), (250,), 8)
+        self.assertEqual(exact.tolist(), [[True, False, False]])
+        self.assertEqual(tolerant.tolist(), [[True, True, False]])
+
+    def test_content_edges_of_empty_page(self) -> None:
+        width, height = 10, 8
+        pixels = np.full((height, width, 3), self.bg, dtype=np.uint8)
+        background = self.extractor._get_background_mask(pixels, (width, height), self.bg)
+
+        edges = self.extractor._get_content_edges(background, (0, 0, 0, 0))
+        self.assertIsNone(edges)
+
+
 if __name__ == "__main__":
     unittest.main()
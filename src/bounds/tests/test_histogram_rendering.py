@@ -0,0 +1,104 @@
+import tracemalloc
+import unittest
+
+import pymupdf
+
+from borders import BorderSpec, BorderUnit, FourBorders
+from bounds.histogram_bounds import HistogramBoundsExtractor
+from bounds.render_profiles import RENDER_PROFILE_MAPPING
+from bounds.settings import ExtractorSettings
+
+
+class HistogramBoundsExtractorMultiResolutionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        zero = BorderSpec(0.0, BorderUnit.POINT)
+        self.borders = FourBorders(zero, zero, zero, zero)
+        self.doc = pymupdf.open()
+        page = self.doc.new_page(width=300, height=400)
+        page.draw_rect(page.rect, color=(0, 0, 0), width=4)
+        page.insert_text((47.3, 91.7), "Multi-resolution", fontsize=13)
+        page.draw_line((61.2, 301.4), (233.9, 301.4), color=(0, 0, 1), width=0.7)
+        self.doc.new_page(width=300, height=400)
+
+    def tearDown(self) -> None:
+        self.doc.close()
+
+    def test_matches_full_resolution_bounds(self) -> None:
+        full = HistogramBoundsExtractor(self.borders)
+        multi = HistogramBoundsExtractor(self.borders, ExtractorSettings(multi_resolution=True))
+
+        expected = full.get_bounds(self.doc, 200)
+        actual = multi.get_bounds(self.doc, 200)
+        self.assertEqual([tuple(rect) for rect in actual], [tuple(rect) for rect in expected])
+        self.assertLess(sum(multi.pixels_rendered), sum(full.pixels_rendered) / 4)
+
+
+class HistogramBoundsExtractorPixelBudgetTests(unittest.TestCase):
+    def test_page_dpi_follows_page_size(self) -> None:
+        zero = BorderSpec(0.0, BorderUnit.POINT)
+        settings = ExtractorSettings(max_megapixels=0.5)
+        extractor = HistogramBoundsExtractor(FourBorders(zero, zero, zero, zero), settings)
+        doc = pymupdf.open()
+        for width, height in ((200, 300), (1600, 2400)):
+            page = doc.new_page(width=width, height=height)
+            page.draw_rect(pymupdf.Rect(width / 4, height / 4, width / 2, height / 2), fill=(0, 0, 0))
+
+        bounds = extractor.get_bounds(doc, None)
+        for pixels in extractor.pixels_rendered:
+            self.assertLessEqual(pixels, 500_000)
+            self.assertGreater(pixels, 450_000)
+        self.assertAlmostEqual(bounds[1].x0, 400, delta=3)
+        self.assertAlmostEqual(bounds[1].y1, 1200, delta=3)
+
+
+class HistogramBoundsExtractorBandBudgetTests(unittest.TestCase):
+    def test_peak_memory_follows_band_budget(self) -> None:
+        zero = BorderSpec(0.0, BorderUnit.POINT)
+        settings = ExtractorSettings(band_budget=0.25, show_progress=False)
+        extractor = HistogramBoundsExtractor(FourBorders(zero, zero, zero, zero), settings)
+        doc = pymupdf.open()
+        page = doc.new_page(width=595, height=842)
+        page.draw_rect(pymupdf.Rect(100, 120, 400, 600), color=None, fill=(0.2, 0.4, 0.8))
+        page.insert_text((120, 700), "Banded", fontsize=20, color=(1, 0, 0))
+
+        # an RGB image of the whole page at 300 DPI would take 26 MB
+        tracemalloc.start()
+        try:
+            bounds = extractor.get_bounds(doc, 300)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(peak, 8 * 1024 * 1024)
+        self.assertAlmostEqual(bounds[0].x0, 100, delta=1)
+        self.assertAlmostEqual(bounds[0].y0, 120, delta=1)
+
+
+class HistogramBoundsExtractorClipTests(unittest.TestCase):
+    def test_clipped_renders_match_full_page_for_every_profile(self) -> None:
+        zero = BorderSpec(0.0, BorderUnit.POINT)
+        borders = FourBorders(zero, zero, zero, zero)
+        doc = pymupdf.open()
+        for offset in (0.0, 0.3, 0.6):
+            page = doc.new_page(width=300, height=400)
+            page.insert_text((47.3 + offset, 320), "Hairlines", fontsize=11)
+            # Hairlines at the content edges end up on the last row or column of a band.
+            page.draw_line((47 + offset, 347 + offset), (275.5 + offset, 347 + offset), width=0)
+            page.draw_line((275.5 + offset, 100), (275.5 + offset, 347 + offset), width=0)
+
+        for profile in RENDER_PROFILE_MAPPING:
+            for dpi in (None, 150, 300):
+                with self.subTest(profile=profile, dpi=dpi):
+                    expected = HistogramBoundsExtractor(
+                        borders, ExtractorSettings(render_profile=profile, show_progress=False)
+                    ).get_bounds(doc, dpi)
+                    for options in ({"band_budget": 0.01}, {"multi_resolution": True}):
+                        settings = ExtractorSettings(render_profile=profile, show_progress=False, **options)
+                        actual = HistogramBoundsExtractor(borders, settings).get_bounds(doc, dpi)
+                        self.assertEqual(
+                            [tuple(rect) for rect in actual], [tuple(rect) for rect in expected], options
+                        )
+
+
+if __name__ == "__main__":
+    unittest.main()
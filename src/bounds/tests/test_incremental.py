@@ -0,0 +1,59 @@
+import unittest
+
+import pymupdf
+
+from bounds.factory import get_bounds_extractor
+from bounds.incremental import IncrementalBoundsExtractor
+from bounds.settings import ExtractorSettings
+from helpers import CountingExtractor, make_doc, no_borders
+
+
+class IncrementalBoundsTests(unittest.TestCase):
+    def _run(
+        self,
+        doc: pymupdf.Document,
+        previous,
+        settings: ExtractorSettings = ExtractorSettings(),
+        extractor_name: str = "text_page",
+        options: dict | None = None,
+    ) -> tuple[IncrementalBoundsExtractor, CountingExtractor, list[pymupdf.Rect]]:
+        counting = CountingExtractor(get_bounds_extractor(extractor_name, no_borders(), settings))
+        extractor = IncrementalBoundsExtractor(
+            counting, extractor_name, previous, no_borders(), settings, options
+        )
+        bounds = extractor.get_bounds(doc, None)
+        return extractor, counting, bounds
+
+    def test_only_changed_pages_are_extracted(self) -> None:
+        doc = make_doc(5)
+        first, _, _ = self._run(doc, None)
+        doc[3].insert_text((150, 150), "Fix", fontsize=10)
+
+        second, counting, bounds = self._run(doc, first.manifest)
+
+        self.assertEqual(counting.pages, [3])
+        self.assertEqual(bounds, get_bounds_extractor("text_page", no_borders()).get_bounds(doc, None))
+        self.assertEqual(second.manifest.digests[:3], first.manifest.digests[:3])
+        self.assertNotEqual(second.manifest.digests[3], first.manifest.digests[3])
+
+    def test_other_settings_extract_all_pages(self) -> None:
+        doc = make_doc(5)
+        first, _, _ = self._run(doc, None, extractor_name="histogram")
+
+        _, counting, _ = self._run(
+            doc, first.manifest, ExtractorSettings(render_profile="fast"), extractor_name="histogram"
+        )
+
+        self.assertEqual(counting.pages, [0, 1, 2, 3, 4])
+
+    def test_sampled_manifest_is_not_reused_without_sampling(self) -> None:
+        doc = make_doc(5)
+        first, _, _ = self._run(doc, None, options={"sample_pages": 2})
+
+        _, counting, _ = self._run(doc, first.manifest, options={"sample_pages": None})
+
+        self.assertEqual(counting.pages, [0, 1, 2, 3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
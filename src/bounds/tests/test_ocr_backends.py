@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+
+import pymupdf
+
+from bounds.ocr_backends import PytesseractBackend, TesserocrBackend, get_ocr_backend
+
+
+class PytesseractBackendTests(unittest.TestCase):
+    def test_returns_boxes_of_non_empty_words(self) -> None:
+        pix = pymupdf.Pixmap(pymupdf.csGRAY, pymupdf.IRect(0, 0, 20, 10), False)
+        ocr_data = {
+            "text": ["", "word", "  ", "other"],
+            "left": [0, 2, 4, 10],
+            "top": [0, 3, 1, 4],
+            "width": [20, 5, 2, 6],
+            "height": [10, 4, 2, 3],
+        }
+        with mock.patch("pytesseract.image_to_data", return_value=ocr_data):
+            boxes = PytesseractBackend().get_word_boxes(pix)
+
+        self.assertEqual(boxes, [(2, 3, 7, 7), (10, 4, 16, 7)])
+
+    def test_unknown_backend(self) -> None:
+        with self.assertRaises(ValueError):
+            get_ocr_backend("unknown")
+
+
+class TesserocrBackendTests(unittest.TestCase):
+    def test_skips_words_without_boxes(self) -> None:
+        pix = pymupdf.Pixmap(pymupdf.csGRAY, pymupdf.IRect(0, 0, 20, 10), False)
+        words = []
+        for text, box in (("word", (2, 3, 7, 7)), ("", None), ("other", None), ("last", (10, 4, 16, 7))):
+            word = mock.Mock()
+            word.GetUTF8Text.return_value = text
+            word.BoundingBox.return_value = box
+            words.append(word)
+        fake_tesserocr = mock.Mock()
+        fake_tesserocr.iterate_level.return_value = words
+        with mock.patch("bounds.ocr_backends.tesserocr", fake_tesserocr):
+            boxes = TesserocrBackend().get_word_boxes(pix)
+
+        self.assertEqual(boxes, [(2, 3, 7, 7), (10, 4, 16, 7)])
+
+
+if __name__ == "__main__":
+    unittest.main()
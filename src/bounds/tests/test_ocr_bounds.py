@@ -0,0 +1,107 @@
+import unittest
+from unittest import mock
+
+import pymupdf
+
+from bounds.ocr_bounds import OCRBoundsExtractor
+from bounds.settings import ExtractorSettings
+from helpers import no_borders
+
+
+class OCRTrimTests(unittest.TestCase):
+    def test_ocr_runs_only_on_trimmed_content(self) -> None:
+        doc = pymupdf.open()
+        doc.new_page(width=200, height=200)
+        page = doc.new_page(width=200, height=200)
+        page.draw_rect(pymupdf.Rect(50, 60, 100, 80), color=(0, 0, 0), fill=(0, 0, 0))
+        images: list[pymupdf.Pixmap] = []
+
+        def get_word_boxes(pix: pymupdf.Pixmap) -> list[tuple[int, int, int, int]]:
+            images.append(pix)
+            return [(0, 0, pix.width, pix.height)]
+
+        extractor = OCRBoundsExtractor(no_borders(), ExtractorSettings(ocr_trim=True))
+        with mock.patch("bounds.ocr_backends.PytesseractBackend.get_word_boxes", side_effect=get_word_boxes):
+            rectangles = extractor.get_bounds(doc, 72)
+
+        # The blank page is never OCR'd and the other one only around its content.
+        self.assertEqual(len(images), 1)
+        self.assertLess(images[0].width * images[0].height, 100 * 100)
+        self.assertTrue(rectangles[1].contains(pymupdf.Rect(50, 60, 100, 80)))
+        self.assertTrue(pymupdf.Rect(40, 50, 110, 90).contains(rectangles[1]))
+
+    def test_x_height_lowers_dpi(self) -> None:
+        extractor = OCRBoundsExtractor(no_borders(), ExtractorSettings(ocr_x_height=20))
+        doc = pymupdf.open()
+        for fontsize in (12, 24):
+            page = doc.new_page(width=300, height=400)
+            page.draw_rect(page.rect + (5, 5, -5, -5), width=1)
+            _insert_lines(page, fontsize)
+        frame = doc.new_page(width=300, height=400)
+        frame.draw_rect(frame.rect + (5, 5, -5, -5), width=1)
+
+        # The ink of 12-point lines is about 10 points high, so their x-height of
+        # about 5 points renders 20 pixels high at about 280 DPI; half as much for 24 points.
+        self.assertAlmostEqual(extractor._get_x_height_dpi(doc[0], 500), 280, delta=40)
+        self.assertAlmostEqual(extractor._get_x_height_dpi(doc[1], 500), 140, delta=25)
+        self.assertEqual(extractor._get_x_height_dpi(doc[0], 200), 200)
+        # a page without text lines keeps its DPI
+        self.assertEqual(extractor._get_x_height_dpi(frame, 500), 500)
+
+    def test_x_height_dpi_depends_only_on_the_page(self) -> None:
+        extractor = OCRBoundsExtractor(no_borders(), ExtractorSettings(ocr_x_height=20))
+        doc = pymupdf.open()
+        for fontsize in (24, 12):
+            page = doc.new_page(width=300, height=400)
+            _insert_lines(page, fontsize)
+        dpis: list[list[int]] = []
+
+        def get_word_boxes(pix: pymupdf.Pixmap) -> list[tuple[int, int, int, int]]:
+            dpis[-1].append(round(pix.width / 300 * 72))
+            return [(0, 0, pix.width, pix.height)]
+
+        with mock.patch("bounds.ocr_backends.PytesseractBackend.get_word_boxes", side_effect=get_word_boxes):
+            for pages in ([0, 1], [1]):
+                dpis.append([])
+                extractor.get_bounds(doc, 500, pages)
+
+        self.assertEqual(dpis[0][1], dpis[1][0])
+
+
+def _insert_lines(page: pymupdf.Page, fontsize: float) -> None:
+    """Fill the page with lines of text in the given size."""
+    text = "Lorem ipsum dolor sit amet. " * 4
+    assert page.insert_textbox(page.rect + (30, 30, -30, -30), text, fontsize=fontsize) >= 0
+
+
+def _get_dark_word_boxes(pix: pymupdf.Pixmap) -> list[tuple[int, int, int, int]]:
+    """Stand-in for Tesseract reporting every dark pixel as a word."""
+    return [
+        (x, y, x + 1, y + 1)
+        for y in range(pix.height)
+        for x in range(pix.width)
+        if pix.pixel(x, y)[0] < 128
+    ]
+
+
+class OCRWorkersTests(unittest.TestCase):
+    def test_workers_return_bounds_in_page_order(self) -> None:
+        doc = pymupdf.open()
+        for i in range(6):
+            page = doc.new_page(width=100, height=100)
+            if i != 3:
+                page.draw_rect(pymupdf.Rect(10 + i, 20, 30 + 5 * i, 40 + i), color=(0, 0, 0), fill=(0, 0, 0))
+
+        with mock.patch(
+            "bounds.ocr_backends.PytesseractBackend.get_word_boxes", side_effect=_get_dark_word_boxes
+        ):
+            expected = OCRBoundsExtractor(no_borders()).get_bounds(doc, 36)
+            settings = ExtractorSettings(ocr_workers=2, band_budget=0.0005)
+            rectangles = OCRBoundsExtractor(no_borders(), settings).get_bounds(doc, 36)
+
+        self.assertEqual(rectangles, expected)
+        self.assertEqual(rectangles[3], doc[3].rect)
+
+
+if __name__ == "__main__":
+    unittest.main()
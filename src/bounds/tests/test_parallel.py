@@ -0,0 +1,35 @@
+import unittest
+
+import pymupdf
+
+from bounds.factory import get_bounds_extractor
+from bounds.parallel import ParallelBoundsExtractor
+from bounds.settings import ExtractorSettings
+from helpers import no_borders
+
+
+class ParallelBoundsTests(unittest.TestCase):
+    def test_same_bounds_in_page_order(self) -> None:
+        doc = pymupdf.open()
+        for i in range(7):
+            page = doc.new_page(width=200, height=200)
+            if i != 4:
+                page.insert_text((20 + 10 * i, 50 + 5 * i), f"Page {i}", fontsize=10)
+        settings = ExtractorSettings(show_progress=False)
+        extractor = ParallelBoundsExtractor("histogram", no_borders(), settings, workers=2, chunk_size=2)
+
+        expected = get_bounds_extractor("histogram", no_borders(), settings).get_bounds(doc, None)
+
+        self.assertEqual(extractor.get_bounds(doc, None), expected)
+        self.assertEqual(extractor.get_bounds(doc, None, [5, 6, 1]), [expected[5], expected[6], expected[1]])
+
+    def test_chunks_are_consecutive_runs(self) -> None:
+        extractor = ParallelBoundsExtractor("text_page", no_borders(), chunk_size=3)
+
+        chunks = extractor._get_chunks([0, 1, 2, 3, 4, 7, 8, 2])
+
+        self.assertEqual(chunks, [range(0, 3), range(3, 5), range(7, 9), range(2, 3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+import pymupdf
+
+from bounds.factory import get_bounds_extractor
+from bounds.sampled import SampledBoundsExtractor
+from bounds.settings import ExtractorSettings
+from helpers import CountingExtractor, no_borders
+
+
+class SampledBoundsTests(unittest.TestCase):
+    def test_groups_share_bounds_and_outliers_are_extracted(self) -> None:
+        doc = pymupdf.open()
+        for i in range(40):
+            page = doc.new_page(width=300, height=400)
+            # odd and even pages have their text on different sides
+            x = 40 if i % 2 == 0 else 80
+            page.draw_rect(pymupdf.Rect(x, 50, x + 150, 300), color=None, fill=(0, 0, 0))
+        doc[17].draw_rect(pymupdf.Rect(250, 350, 280, 380), color=None, fill=(0, 0, 0))
+        doc.new_page(width=500, height=400).draw_rect(pymupdf.Rect(10, 10, 20, 20), fill=(0, 0, 0))
+        inner = get_bounds_extractor("bbox", no_borders())
+        counting = CountingExtractor(inner)
+
+        bounds = SampledBoundsExtractor(counting, no_borders(), sample_size=4).get_bounds(doc, None)
+        expected = inner.get_bounds(doc, None)
+
+        # 4 odd and 4 even pages, the page with a mark and the wider page
+        self.assertEqual(len(counting.pages), 10)
+        self.assertIn(17, counting.pages)
+        self.assertIn(40, counting.pages)
+        self.assertEqual(bounds[17], expected[17])
+        self.assertEqual(bounds[40], expected[40])
+        for page_number, (rect, expected_rect) in enumerate(zip(bounds, expected)):
+            self.assertTrue(rect.contains(expected_rect), page_number)
+        self.assertNotEqual(bounds[0], bounds[1])
+
+    def test_scanned_pages_get_the_bounds_of_the_sample(self) -> None:
+        # white scans with a dark block, painted as one full-page image each
+        samples = bytearray(b"\xff" * 300 * 400 * 3)
+        for y in range(71, 329):
+            samples[(y * 300 + 40) * 3 : (y * 300 + 239) * 3] = b"\x00" * 199 * 3
+        scan = pymupdf.Pixmap(pymupdf.csRGB, 300, 400, bytes(samples), False)
+        doc = pymupdf.open()
+        for _ in range(6):
+            doc.new_page(width=300, height=400).insert_image(pymupdf.Rect(0, 0, 300, 400), pixmap=scan)
+        inner = get_bounds_extractor(
+            "histogram", no_borders(), ExtractorSettings(show_progress=False)
+        )
+        counting = CountingExtractor(inner)
+
+        bounds = SampledBoundsExtractor(counting, no_borders(), sample_size=1).get_bounds(doc, None)
+        expected = inner.get_bounds(doc, None)
+
+        # the bbox check skips full-page images, so only one page of each group is extracted
+        self.assertEqual(len(counting.pages), 2)
+        for page_number, (rect, expected_rect) in enumerate(zip(bounds, expected)):
+            self.assertEqual(rect, expected_rect, page_number)
+            self.assertNotEqual(rect, doc[page_number].rect, page_number)
+
+    def test_groups_without_bounds_are_extracted(self) -> None:
+        doc = pymupdf.open()
+        for _ in range(6):
+            doc.new_page(width=300, height=400)
+        counting = CountingExtractor(get_bounds_extractor("bbox", no_borders()))
+
+        SampledBoundsExtractor(counting, no_borders(), sample_size=1).get_bounds(doc, None)
+
+        self.assertEqual(sorted(counting.pages), list(range(6)))
+
+
+if __name__ == "__main__":
+    unittest.main()
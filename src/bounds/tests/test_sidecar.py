@@ -0,0 +1,65 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pymupdf
+
+from bounds.factory import get_bounds_extractor
+from bounds.settings import ExtractorSettings
+from bounds.sidecar import BoundsSidecar, SidecarBoundsExtractor, load_sidecar, save_sidecar
+from helpers import make_doc, no_borders, point_borders
+
+
+class BoundsSidecarTests(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_round_trip(self) -> None:
+        doc = make_doc(3, height=300, blank=(1,))
+        raw_bounds = list(get_bounds_extractor("histogram", no_borders()).iter_raw_bounds(doc, 150))
+        sidecar = BoundsSidecar.create(doc, raw_bounds, "histogram", 150, ExtractorSettings())
+
+        for suffix in (".json", ".npz"):
+            with self.subTest(suffix=suffix):
+                path = self.directory / f"bounds{suffix}"
+                save_sidecar(sidecar, path)
+
+                loaded = load_sidecar(path)
+
+                self.assertEqual(loaded.extractor, "histogram")
+                self.assertEqual(loaded.dpi, 150)
+                self.assertEqual(loaded.settings["render_profile"], "default")
+                # only the settings the extractor reads
+                self.assertNotIn("ocr_backend", loaded.settings)
+                self.assertEqual(loaded.page_sizes, [(200, 300)] * 3)
+                self.assertIsNone(loaded.bounds[1])
+                self.assertEqual(loaded.bounds, raw_bounds)
+
+    def test_crop_bounds_from_sidecar_match_extraction(self) -> None:
+        doc = make_doc(3, height=300, blank=(1,))
+        raw_bounds = list(get_bounds_extractor("text_page", no_borders()).iter_raw_bounds(doc, None))
+        sidecar = BoundsSidecar.create(doc, raw_bounds, "text_page", None, ExtractorSettings())
+
+        bounds = SidecarBoundsExtractor(sidecar, point_borders(5)).get_bounds(doc, None)
+
+        self.assertEqual(bounds, get_bounds_extractor("text_page", point_borders(5)).get_bounds(doc, None))
+
+    def test_rejects_other_document(self) -> None:
+        doc = make_doc(3, height=300, blank=(1,))
+        sidecar = BoundsSidecar.create(doc, [None] * 3, "text_page", None, ExtractorSettings())
+        other = pymupdf.open()
+        for _ in range(3):
+            other.new_page(width=300, height=300)
+
+        with self.assertRaises(ValueError):
+            SidecarBoundsExtractor(sidecar, no_borders()).get_bounds(other, None)
+        with self.assertRaises(ValueError):
+            SidecarBoundsExtractor(sidecar, no_borders()).get_bounds(other, None, [0])
+        with self.assertRaises(ValueError):
+            save_sidecar(sidecar, self.directory / "bounds.csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+import pymupdf
+
+from bounds.text_bounds import (BlockRectBoundsExtractor, TextBlocksAndImageBoundsExtractor,
+                               TextPageBoundsExtractor)
+from helpers import no_borders
+
+
+class BlockRectBoundsTests(unittest.TestCase):
+    def test_same_bounds_as_text_page(self) -> None:
+        doc = pymupdf.open()
+        page = doc.new_page(width=300, height=400)
+        page.insert_text((50, 80), "First block", fontsize=11)
+        page.insert_textbox(pymupdf.Rect(40, 200, 250, 300), "Second block " * 20, fontsize=9)
+        doc.new_page(width=300, height=400)
+
+        expected = TextPageBoundsExtractor(no_borders()).get_bounds(doc, None)
+        rectangles = BlockRectBoundsExtractor(no_borders()).get_bounds(doc, None)
+
+        self.assertEqual(rectangles, expected)
+        self.assertEqual(rectangles[1], doc[1].rect)
+
+    def test_same_bounds_for_text_past_the_mediabox(self) -> None:
+        doc = pymupdf.open()
+        page = doc.new_page(width=200, height=200)
+        page.insert_text((20, 40), "Inside", fontsize=11)
+        page.insert_text((150, 100), "Overflowing text", fontsize=12)
+
+        expected = list(TextPageBoundsExtractor(no_borders()).iter_raw_bounds(doc, None))
+        rectangles = list(BlockRectBoundsExtractor(no_borders()).iter_raw_bounds(doc, None))
+
+        self.assertEqual(rectangles, expected)
+
+
+class ImageBoundsTests(unittest.TestCase):
+    def test_includes_images_in_form_xobjects(self) -> None:
+        pix = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 4, 4), False)
+        pix.clear_with(0)
+        src = pymupdf.open()
+        src.new_page(width=100, height=100).insert_image(pymupdf.Rect(10, 10, 50, 50), pixmap=pix)
+        doc = pymupdf.open()
+        page = doc.new_page(width=300, height=400)
+        page.insert_text((50, 80), "Caption", fontsize=11)
+        page.insert_image(pymupdf.Rect(20, 100, 40, 120), pixmap=pix)
+        # the form XObject maps the source image to (210, 300)-(250, 340)
+        page.show_pdf_page(pymupdf.Rect(200, 290, 300, 390), src, 0)
+
+        rectangles = TextBlocksAndImageBoundsExtractor(no_borders()).get_bounds(doc, None)
+
+        self.assertEqual(rectangles[0].x0, 20)
+        self.assertEqual(rectangles[0].br, pymupdf.Point(250, 340))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
 from typing import TypedDict, override
 import pymupdf
 
@@ -15,12 +16,14 @@ class TextBlock(TypedDict):
 class TextBlocksBoundsExtractor(BoundsExtractor, ABC):
     _use_image_bounds: bool = False
 
-    def get_bounds(
-        self, doc: pymupdf.Document, dpi: int | None
-    ) -> list[pymupdf.Rect]:
+    def iter_raw_bounds(
+        self,
+        doc: pymupdf.Document,
+        dpi: int | None,
+        pages: Sequence[int] | None = None,
+    ) -> Iterator[pymupdf.Rect | None]:
         _ = dpi
-        rectangles: list[pymupdf.Rect] = []
-        for page in doc:
+        for page in self._iter_doc_pages(doc, pages):
             # initialize to extremes
             x0, y0 = float("inf"), float("inf")
             x1, y1 = 0, 0
@@ -36,31 +39,20 @@ class TextBlocksBoundsExtractor(BoundsExtractor, ABC):
                 x0, y0 = min(x0, img_rect.x0), min(y0, img_rect.y0)
                 x1, y1 = max(x1, img_rect.x1), max(y1, img_rect.y1)
 
-            rect = self._get_rectangle(
-                 bounds=pymupdf.Rect(
-                    x0=x0,
-                    y0=y0,
-                    x1=x1,
-                    y1=y1,
-                ),
-                has_content=len(text_blocks) != 0,
-                page_rect=page.rect,
-            )
-            rectangles.append(rect)
-        return rectangles
+            if len(text_blocks) == 0:
+                yield None
+                continue
+            yield pymupdf.Rect(x0=x0, y0=y0, x1=x1, y1=y1)
 
     @staticmethod
     def _get_images_bounds(page: pymupdf.Page) -> pymupdf.Rect:
         x0, y0 = float("inf"), float("inf")
         x1, y1 = 0, 0
 
-        for img in page.get_images(full=True):
-            img_bbox = page.get_image_bbox(img)
-            if isinstance(img_bbox, tuple):
-                img_rect = img_bbox[0]
-            else:
-                img_rect = img_bbox
-            ix0, iy0, ix1, iy1 = img_rect.x0, img_rect.y0, img_rect.x1, img_rect.y1
+        # One pass over the page content finds every displayed image, including
+        # inline images and images inside form XObjects.
+        for img_info in page.get_image_info():
+            ix0, iy0, ix1, iy1 = img_info["bbox"]
 
             x0, y0 = min(x0, ix0), min(y0, iy0)
             x1, y1 = max(x1, ix1), max(y1, iy1)
@@ -88,9 +80,30 @@ class DictTextBoundsExtractor(TextBlocksBoundsExtractor):
         return page.get_text("dict")["blocks"]  # type: ignore
 
 
+class BlockRectBoundsExtractor(TextBlocksBoundsExtractor):
+    """
+    Get only the rectangles of the text blocks, unsorted and without building
+    the lines, spans and characters of the Python dictionary.
+    """
+
+    @staticmethod
+    @override
+    def _get_text_blocks(page: pymupdf.Page) -> list[TextBlock]:
+        # The flags of ``get_textpage()``, so text past the MediaBox is clipped like in `text_page`.
+        blocks = page.get_text("blocks", flags=0, sort=False)
+        return [
+            TextBlock(number=block_no, type=block_type, bbox=(x0, y0, x1, y1), lines=[])
+            for x0, y0, x1, y1, _, block_no, block_type in blocks
+        ]
+
+
 class TextBlocksAndImageBoundsExtractor(TextPageBoundsExtractor):
     _use_image_bounds: bool = True
 
 
 class DictTextAndImageBoundsExtractor(DictTextBoundsExtractor):
     _use_image_bounds: bool = True
+
+
+class BlockRectAndImageBoundsExtractor(BlockRectBoundsExtractor):
+    _use_image_bounds: bool = True
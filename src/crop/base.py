@@ -1,13 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Sequence
+from collections.abc import Iterable
 
 import pymupdf
 
 
 class Cropper(ABC):
+    # Whether ``crop`` changes the pages of the given document instead of building a new one.
+    in_place: bool = False
+
     def __init__(self, doc: pymupdf.Document):
         self._doc = doc
 
     @abstractmethod
-    def crop(self, bounds: Sequence[pymupdf.Rect]) -> pymupdf.Document:
+    def crop(self, bounds: Iterable[pymupdf.Rect]) -> pymupdf.Document:
+        """
+        Crop the pages to ``bounds``, given in page order; each page is cropped as
+        soon as its bounds arrive, so they may be produced while cropping.
+        """
         pass
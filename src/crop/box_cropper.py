@@ -1,4 +1,4 @@
-from collections.abc import Sequence
+from collections.abc import Iterable
 from typing import override
 
 import pymupdf
@@ -10,8 +10,10 @@ class BoxCropper(Cropper):
     """Crop each page by setting its CropBox to the computed bounds,
     without scaling the content."""
 
+    in_place = True
+
     @override
-    def crop(self, bounds: Sequence[pymupdf.Rect]) -> pymupdf.Document:
+    def crop(self, bounds: Iterable[pymupdf.Rect]) -> pymupdf.Document:
         for page_index, rect in enumerate(bounds):
             page = self._doc[page_index]
             page.set_cropbox(rect)
@@ -1,4 +1,4 @@
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 import warnings
 from typing import Any, override
 
@@ -13,21 +13,28 @@ from .annotations import copy_annotations
 
 class ScaleCropper(Cropper):
     @override
-    def crop(self, bounds: Sequence[pymupdf.Rect]) -> pymupdf.Document:
+    def crop(self, bounds: Iterable[pymupdf.Rect]) -> pymupdf.Document:
         output_doc: pymupdf.Document = pymupdf.open()
+        # Annotations, links and the outline refer to other pages, so they are
+        # copied once the bounds of all pages are known.
+        page_bounds: list[pymupdf.Rect] = []
         for page_num, clipped_rect in enumerate(bounds):
+            page_bounds.append(clipped_rect)
             src_page = self._doc[page_num]
             width, height = src_page.rect.width, src_page.rect.height
             new_page: pymupdf.Page = output_doc.new_page(width=width, height=height)  # type: ignore[reportUnknownMemberType]
 
-            # draw clipped area into full page
+            # draw clipped area into full page; PyMuPDF grafts every page of
+            # ``self._doc`` into ``output_doc`` through one graft map
+            # (``output_doc.Graftmaps``), so fonts and images shared by the
+            # pages are copied once (see benchmarks/scale_cropper.py)
             new_page.show_pdf_page(  # type: ignore[reportUnknownMemberType]
                 pymupdf.Rect(0, 0, width, height),
                 self._doc,
                 page_num,
                 clip=clipped_rect,
             )
-        self._copy_properties(bounds, output_doc)
+        self._copy_properties(page_bounds, output_doc)
         return output_doc
 
     def _copy_properties(
@@ -1,10 +1,19 @@
 import argparse
+import dataclasses
+import logging
+import sys
+from collections.abc import Callable
 from pathlib import Path
 
 from borders import BorderSpec, BorderUnit, FourBorders, expand_css_border, parse_border
-from bounds import EXTRACTOR_MAPPING
+from bounds import (BACKGROUND_ESTIMATOR_MAPPING, EXTRACTOR_MAPPING,
+                    OCR_BACKEND_MAPPING, RENDER_PROFILE_MAPPING)
 from crop import CROPPER_MAPPING
 from processing import ProcessPdfRequest, process_pdf
+from saving import SAVE_PROFILE_MAPPING, PdfSource, PdfTarget, check_save_profile, get_save_profile
+
+# Path given for stdin (`-i`) or stdout (`-d`).
+STDIO_PATH = Path("-")
 
 
 def main():
@@ -14,14 +23,17 @@ def main():
         "--input",
         type=Path,
         required=True,
-        help="Path to the PDF file.",
+        help="Path to the PDF file, or `-` to read it from stdin.",
     )
     parser.add_argument(
         "-d",
         "--output-dir",
         type=Path,
-        required=True,
-        help="Directory where the cropped PDF will be saved to.",
+        default=None,
+        help=(
+            "Directory where the cropped PDF will be saved to, or `-` to write it to stdout "
+            "(required unless `--export-bounds` is given)."
+        ),
     )
     parser.add_argument(
         "-n",
@@ -30,6 +42,69 @@ def main():
         default=None,
         help="Optional output filename (without extension). Defaults to the input basename.",
     )
+    sidecar_group = parser.add_mutually_exclusive_group()
+    sidecar_group.add_argument(
+        "--export-bounds",
+        type=Path,
+        default=None,
+        metavar="SIDECAR",
+        help=(
+            "Only extract the bounds and write them, before the borders are added, to this "
+            "sidecar file (`.json` or `.npz`) instead of cropping the PDF."
+        ),
+    )
+    sidecar_group.add_argument(
+        "--import-bounds",
+        type=Path,
+        default=None,
+        metavar="SIDECAR",
+        help="Crop with the bounds of this sidecar file (`.json` or `.npz`) instead of extracting them.",
+    )
+    parser.add_argument(
+        "--incremental",
+        type=Path,
+        default=None,
+        metavar="MANIFEST",
+        help=(
+            "Manifest (`.json` or `.npz`) with the page digests and bounds of the previous run. "
+            "Only new and changed pages are extracted; the manifest is updated afterwards."
+        ),
+    )
+    add_processing_arguments(parser)
+    args = parser.parse_args()
+    if args.import_bounds is not None and args.incremental is not None:
+        parser.error("argument --incremental: not allowed with argument --import-bounds")
+    for sidecar in (args.export_bounds, args.import_bounds, args.incremental):
+        if sidecar is not None and sidecar.suffix not in (".json", ".npz"):
+            parser.error(f"Sidecar files must end with .json or .npz: {sidecar}")
+    if args.output_dir is None and args.export_bounds is None:
+        parser.error("the following arguments are required: -d/--output-dir")
+    from_stdin = args.input == STDIO_PATH
+    to_stdout = args.output_dir == STDIO_PATH
+    if from_stdin and args.name is None and args.output_dir is not None and not to_stdout:
+        parser.error("argument -n/--name: required when the PDF is read from stdin")
+    if get_save_profile(args.save_profile).append and (from_stdin or to_stdout):
+        parser.error(f"--save-profile {args.save_profile} requires an input and an output file.")
+    # Logged to stderr, which keeps stdout for the PDF.
+    logging.basicConfig(level=logging.INFO)
+    source = sys.stdin.buffer if from_stdin else args.input
+    if to_stdout:
+        output = sys.stdout.buffer
+    else:
+        file_name = args.name if args.name is not None else args.input.name
+        output = args.output_dir / file_name if args.output_dir is not None else Path(file_name)
+    request = create_request(parser, args, source, output)
+    request = dataclasses.replace(
+        request,
+        export_bounds=args.export_bounds,
+        import_bounds=args.import_bounds,
+        incremental=args.incremental,
+    )
+    process_pdf(request)
+
+
+def add_processing_arguments(parser: argparse.ArgumentParser):
+    """Add the options that control how a PDF is cropped (shared with the batch mode)."""
     parser.add_argument(
         "-be",
         "--bounds-extractor",
@@ -56,30 +131,206 @@ def main():
         choices=list(CROPPER_MAPPING.keys()),
         help="Cropping strategy used to trim page content.",
     )
+    parser.add_argument(
+        "--save-profile",
+        default="fast",
+        choices=list(SAVE_PROFILE_MAPPING.keys()),
+        help=(
+            "How the cropped PDF is written. `fast` writes it as it is, `compact` removes unused "
+            "objects and compresses the rest, `linearized` also linearizes it with qpdf, "
+            "`append` (only with `-c box`) copies the input and appends the changed pages."
+        ),
+    )
     parser.add_argument(
         "--dpi",
-        type=validate_dpi,
+        type=positive(int, "DPI"),
+        default=None,
+        help=(
+            "DPI for rendering page images. Applicable only to `histogram`, `ocr` "
+            "and `components`. If unset: `histogram` uses renderer default (`None`), "
+            "`ocr` uses 500, `components` uses 150."
+        ),
+    )
+    parser.add_argument(
+        "--render-profile",
+        default="default",
+        choices=list(RENDER_PROFILE_MAPPING.keys()),
+        help=(
+            "How page images are rendered. Applicable only to `histogram`, `ocr` and `components`. "
+            "`fast` renders grayscale without alpha, anti-aliasing or annotations."
+        ),
+    )
+    parser.add_argument(
+        "--multi-resolution",
+        action="store_true",
+        help=(
+            "Applicable only to `histogram`. Find approximate bounds at a low DPI and "
+            "re-render only thin strips around each edge at `--dpi`."
+        ),
+    )
+    parser.add_argument(
+        "--background-estimator",
+        default="full",
+        choices=list(BACKGROUND_ESTIMATOR_MAPPING.keys()),
+        help=(
+            "How the background color of page images is estimated. Applicable only to "
+            "`histogram`, `components` and `ocr` with `--ocr-trim`. `sampled` inspects a subset of pixels and reuses the previous "
+            "page's background while it still matches."
+        ),
+    )
+    parser.add_argument(
+        "--band-budget",
+        type=positive(float, "Megapixels"),
+        default=None,
+        metavar="MEGAPIXELS",
+        help=(
+            "Render page images in bands of at most this many megapixels to cap memory "
+            "on huge pages. Applicable only to `histogram` and `ocr`."
+        ),
+    )
+    parser.add_argument(
+        "--max-megapixels",
+        type=positive(float, "Megapixels"),
+        default=None,
+        metavar="MEGAPIXELS",
+        help=(
+            "Derive each page's DPI from its size so that its image has at most this many "
+            "megapixels; `--dpi` (or the extractor default) becomes the upper limit. "
+            "Applicable only to `histogram`, `ocr` and `components`."
+        ),
+    )
+    parser.add_argument(
+        "--ocr-backend",
+        default="pytesseract",
+        choices=list(OCR_BACKEND_MAPPING.keys()),
+        help=(
+            "OCR engine used by `ocr`. `tesserocr` keeps one Tesseract instance loaded "
+            "for the whole document instead of starting `tesseract` for every page."
+        ),
+    )
+    parser.add_argument(
+        "--ocr-trim",
+        action="store_true",
+        help=(
+            "Applicable only to `ocr`. Trim the uniform background in a cheap raster pass "
+            "and run OCR only on the remaining content."
+        ),
+    )
+    parser.add_argument(
+        "--ocr-x-height",
+        type=positive(int, "X-height"),
+        default=None,
+        metavar="PIXELS",
+        help=(
+            "Applicable only to `ocr`. Lower the DPI of each page so that its text, measured "
+            "in a cheap raster pass, renders with this x-height in pixels (Tesseract works best around 20)."
+        ),
+    )
+    parser.add_argument(
+        "--ocr-workers",
+        type=positive(int, "Number of workers"),
+        default=1,
+        metavar="N",
+        help=(
+            "Applicable only to `ocr`. Run OCR in N worker processes while the pages are "
+            "rendered (default: 1, OCR in the main process)."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive(int, "Number of workers"),
+        default=1,
+        metavar="N",
+        help=(
+            "Extract the bounds in N worker processes, each handling chunks of consecutive "
+            "pages (default: 1, extract in the main process)."
+        ),
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=positive(int, "Chunk size"),
+        default=16,
+        metavar="PAGES",
+        help="Number of consecutive pages a worker handles at a time with `--workers` (default: 16).",
+    )
+    parser.add_argument(
+        "--dedupe-pages",
+        action="store_true",
+        help=(
+            "Extract the bounds of identical pages (e.g. blank separators or repeated forms) "
+            "only once, found by a digest of each page's content and resources."
+        ),
+    )
+    parser.add_argument(
+        "--sample-pages",
+        type=positive(int, "Sample size"),
+        default=None,
+        metavar="N",
+        help=(
+            "For documents with the same margins on every page: extract the bounds of N evenly "
+            "spread odd and N even pages only and apply them to all pages of the same parity. "
+            "Pages that differ in size or painted area are still extracted on their own."
+        ),
+    )
+    parser.add_argument(
+        "--bounds-cache",
+        type=Path,
         default=None,
+        metavar="PATH",
         help=(
-            "DPI for rendering page images. Applicable only to `histogram` and "
-            "`ocr`. If unset: `histogram` uses renderer default (`None`), "
-            "`ocr` uses 500."
+            "SQLite file caching the bounds of each page before the borders are added, so "
+            "later runs with other borders or croppers skip the extraction of unchanged pages."
         ),
     )
+    parser.add_argument(
+        "--bounds-cache-size",
+        type=positive(float, "Cache size"),
+        default=256.0,
+        metavar="MEGABYTES",
+        help="Size above which the least recently used entries of `--bounds-cache` are evicted (default: 256).",
+    )
 
-    args = parser.parse_args()
-    file_name = args.name if args.name is not None else args.input.name
-    output = args.output_dir / file_name
+
+def create_request(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    input_path: PdfSource,
+    output_path: PdfTarget,
+) -> ProcessPdfRequest:
+    """Build the request for one PDF from the options added by ``add_processing_arguments``."""
     borders = validate_and_expand_border(parser, args.border)
-    request = ProcessPdfRequest(
-        input_path=args.input,
-        output_path=output,
+    # Only cropping writes a PDF; `--export-bounds` does not exist in the batch mode.
+    if getattr(args, "export_bounds", None) is None:
+        try:
+            check_save_profile(args.save_profile)
+        except RuntimeError as e:
+            parser.error(str(e))
+    if get_save_profile(args.save_profile).append and not CROPPER_MAPPING[args.cropper].in_place:
+        parser.error(f"--save-profile {args.save_profile} requires a cropper that keeps the pages, e.g. `-c box`.")
+    return ProcessPdfRequest(
+        input_path=input_path,
+        output_path=output_path,
         bounds_extractor=args.bounds_extractor,
         borders=borders,
         cropper_name=args.cropper,
+        save_profile=args.save_profile,
         dpi=args.dpi,
+        render_profile=args.render_profile,
+        multi_resolution=args.multi_resolution,
+        background_estimator=args.background_estimator,
+        band_budget=args.band_budget,
+        max_megapixels=args.max_megapixels,
+        ocr_backend=args.ocr_backend,
+        ocr_trim=args.ocr_trim,
+        ocr_x_height=args.ocr_x_height,
+        ocr_workers=args.ocr_workers,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        dedupe_pages=args.dedupe_pages,
+        sample_pages=args.sample_pages,
+        bounds_cache=args.bounds_cache,
+        bounds_cache_size=args.bounds_cache_size,
     )
-    process_pdf(request)
 
 
 def validate_border_input(border: str) -> BorderSpec:
@@ -89,14 +340,20 @@ def validate_border_input(border: str) -> BorderSpec:
         raise argparse.ArgumentTypeError(e)
 
 
-def validate_dpi(raw_value: str) -> int:
-    try:
-        dpi = int(raw_value)
-    except ValueError:
-        raise argparse.ArgumentTypeError("DPI must be an integer.")
-    if dpi <= 0:
-        raise argparse.ArgumentTypeError("DPI must be a positive integer.")
-    return dpi
+def positive[T: (int, float)](type_: Callable[[str], T], name: str) -> Callable[[str], T]:
+    """argparse type of a positive integer or number; ``name`` starts its error messages."""
+    kind, positive_kind = ("an integer", "a positive integer") if type_ is int else ("a number", "positive")
+
+    def validate(raw_value: str) -> T:
+        try:
+            value = type_(raw_value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"{name} must be {kind}.")
+        if value <= 0:
+            raise argparse.ArgumentTypeError(f"{name} must be {positive_kind}.")
+        return value
+
+    return validate
 
 
 def validate_and_expand_border(parser, raw_specs) -> FourBorders:
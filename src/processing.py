@@ -1,29 +1,139 @@
 from dataclasses import dataclass
 from pathlib import Path
 
-import pymupdf
-
 from borders import FourBorders
-from bounds import get_bounds_extractor
-from crop import get_cropper
+from bounds import (BoundsCache, BoundsSidecar, CachedBoundsExtractor,
+                    DeduplicatingBoundsExtractor, ExtractorSettings,
+                    IncrementalBoundsExtractor, ParallelBoundsExtractor, SampledBoundsExtractor,
+                    SidecarBoundsExtractor, get_bounds_extractor, load_sidecar,
+                    save_sidecar)
+from crop import CROPPER_MAPPING, get_cropper
+from saving import (PdfSource, PdfTarget, check_save_profile, get_save_profile, is_file_path,
+                    open_appended_copy, open_document, save_document)
 
 
 @dataclass(frozen=True)
 class ProcessPdfRequest:
-    input_path: Path
-    output_path: Path
+    # A path, the bytes of the PDF (e.g. a memory-mapped file) or a binary file object.
+    input_path: PdfSource
+    # A path or a writable binary stream.
+    output_path: PdfTarget
     bounds_extractor: str
     borders: FourBorders
     cropper_name: str
     dpi: int | None
+    render_profile: str = "default"
+    multi_resolution: bool = False
+    background_estimator: str = "full"
+    band_budget: float | None = None
+    max_megapixels: float | None = None
+    ocr_backend: str = "pytesseract"
+    ocr_trim: bool = False
+    ocr_x_height: int | None = None
+    ocr_workers: int = 1
+    workers: int = 1
+    chunk_size: int = 16
+    show_progress: bool = True
+    save_profile: str = "fast"
+    dedupe_pages: bool = False
+    sample_pages: int | None = None
+    bounds_cache: Path | None = None
+    bounds_cache_size: float = 256.0
+    export_bounds: Path | None = None
+    import_bounds: Path | None = None
+    incremental: Path | None = None
 
 
-def process_pdf(request: ProcessPdfRequest):
-    doc = pymupdf.open(request.input_path)
-    extractor = get_bounds_extractor(request.bounds_extractor, request.borders)
-    bounds = extractor.get_bounds(doc, request.dpi)
-    cropper = get_cropper(request.cropper_name, doc)
-    new_doc = cropper.crop(bounds)
+def process_pdf(request: ProcessPdfRequest) -> int:
+    """
+    Crop the PDF of the request, or only write its bounds to the sidecar of
+    ``export_bounds``, and return its number of pages.
+    """
+    append = False
+    if request.export_bounds is None:
+        check_save_profile(request.save_profile)
+        append = get_save_profile(request.save_profile).append
+        if append and not CROPPER_MAPPING[request.cropper_name].in_place:
+            raise ValueError(
+                f"The `{request.save_profile}` save profile does not work with the "
+                f"`{request.cropper_name}` cropper, which builds a new document."
+            )
+    doc = open_document(request.input_path)
+    settings = ExtractorSettings(
+        render_profile=request.render_profile,
+        multi_resolution=request.multi_resolution,
+        background_estimator=request.background_estimator,
+        band_budget=request.band_budget,
+        max_megapixels=request.max_megapixels,
+        ocr_backend=request.ocr_backend,
+        ocr_trim=request.ocr_trim,
+        ocr_x_height=request.ocr_x_height,
+        ocr_workers=request.ocr_workers,
+        show_progress=request.show_progress,
+    )
+    cache = None
+    incremental = None
+    if request.import_bounds is not None:
+        extractor = SidecarBoundsExtractor(load_sidecar(request.import_bounds), request.borders)
+    else:
+        if request.workers > 1:
+            extractor = ParallelBoundsExtractor(
+                request.bounds_extractor,
+                request.borders,
+                settings,
+                workers=request.workers,
+                chunk_size=request.chunk_size,
+            )
+        else:
+            extractor = get_bounds_extractor(request.bounds_extractor, request.borders, settings)
+        if request.dedupe_pages:
+            extractor = DeduplicatingBoundsExtractor(extractor, request.borders)
+        if request.bounds_cache is not None:
+            cache = BoundsCache(request.bounds_cache, int(request.bounds_cache_size * 1024 * 1024))
+            extractor = CachedBoundsExtractor(
+                extractor, request.bounds_extractor, cache, request.borders, settings
+            )
+        # Outside of the cache, which must only hold bounds of extracted pages.
+        if request.sample_pages is not None:
+            extractor = SampledBoundsExtractor(extractor, request.borders, request.sample_pages)
+        if request.incremental is not None:
+            previous = load_sidecar(request.incremental) if request.incremental.exists() else None
+            incremental = IncrementalBoundsExtractor(
+                extractor,
+                request.bounds_extractor,
+                previous,
+                request.borders,
+                settings,
+                options={"dedupe_pages": request.dedupe_pages, "sample_pages": request.sample_pages},
+            )
+            extractor = incremental
+    try:
+        if request.export_bounds is not None:
+            raw_bounds = list(extractor.iter_raw_bounds(doc, request.dpi))
+            sidecar = BoundsSidecar.create(
+                doc, raw_bounds, request.bounds_extractor, request.dpi, settings
+            )
+            save_sidecar(sidecar, request.export_bounds)
+        elif append:
+            # Extracted before the output is touched, so that a failed run leaves it as it was.
+            bounds = extractor.get_bounds(doc, request.dpi)
+            with open_appended_copy(
+                request.input_path, request.output_path, request.save_profile
+            ) as copy:
+                get_cropper(request.cropper_name, copy).crop(bounds)
+        else:
+            # Each page is cropped as soon as its bounds are extracted.
+            bounds = extractor.iter_bounds(doc, request.dpi)
+            cropper = get_cropper(request.cropper_name, doc)
+            new_doc = cropper.crop(bounds)
+            if is_file_path(request.output_path):
+                Path(request.output_path).parent.mkdir(parents=True, exist_ok=True)
+            save_document(new_doc, request.output_path, request.save_profile)
+    finally:
+        if cache is not None:
+            cache.close()
 
-    Path(request.output_path).parent.mkdir(parents=True, exist_ok=True)
-    new_doc.save(request.output_path)
+    # Written last, so that a failed run is redone in full.
+    if incremental is not None and incremental.manifest is not None:
+        save_sidecar(incremental.manifest, request.incremental)
+    return doc.page_count
@@ -0,0 +1,254 @@
+import io
+import logging
+import mmap
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+import pymupdf
+
+# qpdf exit status for a file written with warnings.
+QPDF_WARNINGS = 3
+
+# A PDF to crop: a file path, the bytes of a PDF (also memory-mapped) or a binary file object.
+PdfSource = str | os.PathLike | bytes | bytearray | memoryview | mmap.mmap | BinaryIO
+# Where the cropped PDF goes: a file path or a writable binary stream (e.g. ``sys.stdout.buffer``).
+PdfTarget = str | os.PathLike | BinaryIO
+
+
+@dataclass(frozen=True, slots=True)
+class SaveProfile:
+    """Options used to write the cropped PDF."""
+
+    # Unused objects to remove (0-4, see pymupdf.Document.save); 4 also merges duplicates.
+    garbage: int
+    # Compress uncompressed streams, images and fonts.
+    deflate: bool
+    # Pack the objects into compressed object streams.
+    use_objstms: bool
+    # Linearize the file with qpdf, so readers can show the first page before loading the rest.
+    linearize: bool
+    # Copy the input file and append only the changed objects to it.
+    append: bool = False
+
+
+SAVE_PROFILE_MAPPING: dict[str, SaveProfile] = {
+    # Write the document as it is, e.g. for intermediate files of a pipeline.
+    "fast": SaveProfile(garbage=0, deflate=False, use_objstms=False, linearize=False),
+    # Drop the objects of the source pages left behind by cropping and compress the rest.
+    "compact": SaveProfile(garbage=4, deflate=True, use_objstms=True, linearize=False),
+    # MuPDF no longer writes linearized files, so a compact file is linearized by qpdf.
+    "linearized": SaveProfile(garbage=4, deflate=True, use_objstms=True, linearize=True),
+    # Only for croppers that change the pages of the input document in place (`box`).
+    "append": SaveProfile(garbage=0, deflate=False, use_objstms=False, linearize=False, append=True),
+}
+
+
+def get_save_profile(name: str) -> SaveProfile:
+    try:
+        return SAVE_PROFILE_MAPPING[name]
+    except KeyError:
+        raise ValueError(f"Unknown save profile: {name!r}")
+
+
+def check_save_profile(name: str) -> None:
+    """Fail before any work is done if the named save profile cannot be used here."""
+    if get_save_profile(name).linearize:
+        _get_qpdf()
+
+
+def is_file_path(location: PdfSource | PdfTarget | None) -> bool:
+    return isinstance(location, (str, os.PathLike))
+
+
+def open_document(source: PdfSource) -> pymupdf.Document:
+    """
+    Open the PDF to crop. Buffers are opened without copying them and files
+    that are not paths are memory-mapped when possible.
+    """
+    if is_file_path(source):
+        return pymupdf.open(source)
+    return pymupdf.open(stream=_get_buffer(source), filetype="pdf")
+
+
+@contextmanager
+def open_appended_copy(
+    source: PdfSource, target: PdfTarget, profile_name: str = "append"
+) -> Iterator[pymupdf.Document]:
+    """
+    Open a copy of the input file for the `append` save profile. The copy is
+    made in the directory of ``target``, the changes made to it in the ``with``
+    block are appended to it and it then replaces ``target``; if anything
+    fails, the copy is removed and ``target`` is left as it was. When ``source``
+    is ``target``, the changes are appended to the input file itself.
+    """
+    if not is_file_path(source) or not is_file_path(target):
+        raise ValueError(f"The `{profile_name}` save profile only works with input and output files.")
+    source, target = Path(source), Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.exists() and target.samefile(source):
+        with pymupdf.open(source) as doc:
+            yield doc
+            start = time.perf_counter()
+            _log_save(target, profile_name, _save_appended(doc, target), start)
+        return
+    fd, name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+    os.close(fd)
+    temporary = Path(name)
+    try:
+        shutil.copyfile(source, temporary)
+        # mkstemp makes the file private to the user.
+        shutil.copymode(source, temporary)
+        with pymupdf.open(temporary) as doc:
+            yield doc
+            start = time.perf_counter()
+            size = _save_appended(doc, temporary)
+        os.replace(temporary, target)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+    _log_save(target, profile_name, size, start)
+
+
+def save_document(doc: pymupdf.Document, target: PdfTarget, profile_name: str = "fast") -> int:
+    """Save ``doc`` to ``target`` with the named save profile and return the bytes written."""
+    profile = get_save_profile(profile_name)
+    start = time.perf_counter()
+    if profile.append:
+        raise ValueError(f"The `{profile_name}` save profile is written by `open_appended_copy`.")
+    if profile.linearize:
+        size = _save_linearized(doc, target, profile)
+    elif is_file_path(target):
+        doc.save(target, **_get_save_options(profile))
+        size = Path(target).stat().st_size
+    else:
+        output = _StreamOutput(target)
+        doc.save(output, **_get_save_options(profile))
+        size = output.written
+    _log_save(target, profile_name, size, start)
+    return size
+
+
+def _get_buffer(source: PdfSource) -> bytes | memoryview:
+    """The bytes of ``source`` for ``pymupdf.open(stream=...)``, copied only if they must be read."""
+    if isinstance(source, (bytes, memoryview)):
+        return source
+    if isinstance(source, (bytearray, mmap.mmap)):
+        # PyMuPDF copies bytearrays, but not views of them.
+        return memoryview(source)
+    if isinstance(source, io.BytesIO):
+        # Shares the buffer while it is unchanged since the BytesIO was created.
+        return source.getvalue()
+    try:
+        if stat.S_ISREG(os.fstat(source.fileno()).st_mode):
+            # e.g. a regular file redirected to stdin
+            return memoryview(mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ))
+    except (OSError, ValueError, io.UnsupportedOperation):
+        pass
+    # Pipes, sockets and other streams can only be read.
+    return source.read()
+
+
+def _get_save_options(profile: SaveProfile) -> dict:
+    return {
+        "garbage": profile.garbage,
+        "deflate": profile.deflate,
+        "deflate_images": profile.deflate,
+        "deflate_fonts": profile.deflate,
+        "use_objstms": profile.use_objstms,
+    }
+
+
+def _save_linearized(doc: pymupdf.Document, target: PdfTarget, profile: SaveProfile) -> int:
+    """Save ``doc`` to a temporary file and linearize it with qpdf into ``target``."""
+    qpdf = _get_qpdf()
+    with tempfile.TemporaryDirectory() as directory:
+        saved = Path(directory) / "saved.pdf"
+        doc.save(saved, **_get_save_options(profile))
+        # qpdf needs to seek in its output, so streams get a copy of a temporary file.
+        linearized = Path(target) if is_file_path(target) else Path(directory) / "linearized.pdf"
+        result = subprocess.run(
+            [qpdf, "--linearize", str(saved), str(linearized)], capture_output=True, text=True
+        )
+        if result.returncode not in (0, QPDF_WARNINGS):
+            raise RuntimeError(f"qpdf failed to linearize {_describe(target)}: {result.stderr.strip()}")
+        if not is_file_path(target):
+            with open(linearized, "rb") as file:
+                shutil.copyfileobj(file, target)
+        return linearized.stat().st_size
+
+
+def _save_appended(doc: pymupdf.Document, path: Path) -> int:
+    """Append the changes of ``doc``, opened from ``path``, to the file; return the bytes appended."""
+    if Path(doc.name).resolve() != path.resolve():
+        raise ValueError(f"Incremental saves must go to the file the document was opened from: {doc.name}")
+    if not doc.can_save_incrementally():
+        # e.g. a damaged file that MuPDF had to repair
+        logging.warning("%s cannot be updated incrementally; rewriting it.", path)
+        temporary = path.with_name(f"{path.name}.tmp")
+        doc.save(temporary)
+        os.replace(temporary, path)
+        return path.stat().st_size
+    size = path.stat().st_size
+    doc.save(path, incremental=True, encryption=pymupdf.PDF_ENCRYPT_KEEP)
+    return path.stat().st_size - size
+
+
+def _get_qpdf() -> str:
+    qpdf = shutil.which("qpdf")
+    if qpdf is None:
+        raise RuntimeError(
+            "The `linearized` save profile requires qpdf (https://qpdf.sourceforge.io/) on the PATH."
+        )
+    return qpdf
+
+
+class _StreamOutput:
+    """
+    Writable stream as PyMuPDF saves to it. Without a ``name``, which PyMuPDF
+    would take for a file name, and with a position of its own, so that pipes
+    such as stdout work too.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self.written = 0
+
+    def write(self, data: bytes) -> int:
+        self._stream.write(data)
+        self.written += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.written
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        # MuPDF only writes forwards; anything else could not be done on a pipe.
+        if (offset, whence) not in ((self.written, io.SEEK_SET), (0, io.SEEK_CUR), (0, io.SEEK_END)):
+            raise io.UnsupportedOperation("The output stream can only be written forwards.")
+        return self.written
+
+    def truncate(self, size: int | None = None) -> int:
+        return self.written
+
+
+def _describe(target: PdfTarget) -> str:
+    return str(target) if is_file_path(target) else getattr(target, "name", type(target).__name__)
+
+
+def _log_save(target: PdfTarget, profile_name: str, size: int, start: float) -> None:
+    logging.info(
+        "Saved %s with the `%s` profile: %d bytes in %.2f s.",
+        _describe(target),
+        profile_name,
+        size,
+        time.perf_counter() - start,
+    )
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pymupdf
+
+import batch
+from batch import collect_pdfs, is_up_to_date
+
+
+def _write_pdf(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = pymupdf.open()
+    page = doc.new_page(width=200, height=300)
+    page.insert_text((40, 80), path.stem, fontsize=10)
+    doc.save(path)
+    doc.close()
+
+
+class BatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.inputs = Path(directory.name) / "in"
+        self.outputs = Path(directory.name) / "out"
+        self.summary = Path(directory.name) / "summary.json"
+        _write_pdf(self.inputs / "good.pdf")
+        (self.inputs / "nested").mkdir()
+        (self.inputs / "nested" / "corrupt.pdf").write_bytes(b"%PDF-1.7\nnot really a PDF")
+        _write_pdf(self.inputs / "done.pdf")
+        _write_pdf(self.outputs / "done.pdf")
+        # the output of done.pdf is newer than its input
+        os.utime(self.inputs / "done.pdf", (0, 0))
+
+    def test_collects_each_pdf_once(self) -> None:
+        pairs = collect_pdfs(
+            [str(self.inputs), str(self.inputs / "good.pdf"), str(self.inputs / "*.pdf")], self.outputs
+        )
+
+        self.assertEqual(
+            pairs,
+            [
+                (self.inputs / "done.pdf", self.outputs / "done.pdf"),
+                (self.inputs / "good.pdf", self.outputs / "good.pdf"),
+                (self.inputs / "nested" / "corrupt.pdf", self.outputs / "nested" / "corrupt.pdf"),
+            ],
+        )
+
+    def test_up_to_date_outputs(self) -> None:
+        self.assertTrue(is_up_to_date(self.inputs / "done.pdf", self.outputs / "done.pdf"))
+        self.assertFalse(is_up_to_date(self.inputs / "good.pdf", self.outputs / "good.pdf"))
+        os.utime(self.inputs / "done.pdf")
+        os.utime(self.outputs / "done.pdf", (0, 0))
+        self.assertFalse(is_up_to_date(self.inputs / "done.pdf", self.outputs / "done.pdf"))
+
+    def test_failure_does_not_stop_the_batch(self) -> None:
+        done = (self.outputs / "done.pdf").read_bytes()
+        argv = [
+            "batch.py",
+            str(self.inputs),
+            "-d",
+            str(self.outputs),
+            "-be",
+            "text_page",
+            "-c",
+            "box",
+            "--summary",
+            str(self.summary),
+        ]
+
+        with (
+            mock.patch.object(sys, "argv", argv),
+            self.assertLogs(level="INFO") as logs,
+            self.assertRaises(SystemExit) as exit,
+        ):
+            batch.main()
+
+        self.assertEqual(exit.exception.code, 1)
+        summary = json.loads(self.summary.read_text())
+        self.assertEqual(
+            {key: summary[key] for key in ("processed", "skipped", "failed", "pages")},
+            {"processed": 1, "skipped": 1, "failed": 1, "pages": 1},
+        )
+        corrupt = self.inputs / "nested" / "corrupt.pdf"
+        self.assertEqual([failure["input"] for failure in summary["failures"]], [str(corrupt)])
+        self.assertTrue((self.outputs / "good.pdf").exists())
+        self.assertFalse((self.outputs / "nested" / "corrupt.pdf").exists())
+        self.assertEqual((self.outputs / "done.pdf").read_bytes(), done)
+        summary_lines = [line for line in logs.output if "Processed 1 PDFs (1 pages)" in line]
+        self.assertEqual(len(summary_lines), 1)
+        self.assertIn("skipped 1 up-to-date, 1 failed", summary_lines[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+import pymupdf
+
+from borders import BorderSpec, BorderUnit, FourBorders
+from bounds import ExtractorSettings, get_bounds_extractor
+from crop import CROPPER_MAPPING, get_cropper
+
+
+def _make_doc() -> pymupdf.Document:
+    doc = pymupdf.open()
+    for i in range(4):
+        page = doc.new_page(width=300, height=400)
+        page.insert_text((40 + 20 * i, 80 + 30 * i), f"Page {i}", fontsize=14)
+        page.draw_rect(pymupdf.Rect(60, 200, 240 - 10 * i, 320), color=None, fill=(0.2, 0.4, 0.8))
+    for i, page in enumerate(doc):
+        page.insert_link(
+            {"kind": pymupdf.LINK_GOTO, "from": pymupdf.Rect(40, 60, 120, 90), "page": (i + 1) % 4}
+        )
+    return doc
+
+
+def _describe(doc: pymupdf.Document) -> list[tuple]:
+    """What a reader sees of each page: its size, image and links."""
+    return [
+        (
+            tuple(page.rect),
+            page.get_pixmap(dpi=36).samples,
+            [(link["kind"], tuple(link["from"]), link.get("page")) for link in page.get_links()],
+        )
+        for page in doc
+    ]
+
+
+class StreamedBoundsTests(unittest.TestCase):
+    def test_streamed_bounds_crop_like_a_list(self) -> None:
+        border = BorderSpec(5, BorderUnit.POINT)
+        borders = FourBorders(border, border, border, border)
+        settings = ExtractorSettings(show_progress=False)
+        for cropper_name in CROPPER_MAPPING:
+            for extractor_name in ("text_page", "histogram"):
+                with self.subTest(cropper=cropper_name, extractor=extractor_name):
+                    extractor = get_bounds_extractor(extractor_name, borders, settings)
+                    listed_doc, streamed_doc = _make_doc(), _make_doc()
+
+                    listed = get_cropper(cropper_name, listed_doc).crop(extractor.get_bounds(listed_doc, None))
+                    # each page is cropped before the bounds of the next one are extracted
+                    streamed = get_cropper(cropper_name, streamed_doc).crop(
+                        extractor.iter_bounds(streamed_doc, None)
+                    )
+
+                    self.assertEqual(_describe(streamed), _describe(listed))
+
+
+if __name__ == "__main__":
+    unittest.main()
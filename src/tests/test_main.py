@@ -0,0 +1,24 @@
+import argparse
+import unittest
+
+from main import positive
+
+
+class PositiveTests(unittest.TestCase):
+    def test_integers(self) -> None:
+        validate = positive(int, "DPI")
+        self.assertEqual(validate("300"), 300)
+        for raw_value, message in (("0", "DPI must be a positive integer."), ("1.5", "DPI must be an integer.")):
+            with self.assertRaisesRegex(argparse.ArgumentTypeError, message):
+                validate(raw_value)
+
+    def test_numbers(self) -> None:
+        validate = positive(float, "Cache size")
+        self.assertEqual(validate("0.5"), 0.5)
+        for raw_value, message in (("-1", "Cache size must be positive."), ("big", "Cache size must be a number.")):
+            with self.assertRaisesRegex(argparse.ArgumentTypeError, message):
+                validate(raw_value)
+
+
+if __name__ == "__main__":
+    unittest.main()
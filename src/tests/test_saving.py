@@ -0,0 +1,244 @@
+import io
+import mmap
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pymupdf
+
+from saving import (_get_buffer, _StreamOutput, check_save_profile, open_appended_copy, open_document,
+                    save_document)
+
+
+def _write_pdf(path: Path) -> bytes:
+    doc = pymupdf.open()
+    for i in range(3):
+        page = doc.new_page(width=200, height=300)
+        page.insert_text((20, 50 + 10 * i), f"Page {i}", fontsize=10)
+    doc.save(path)
+    doc.close()
+    return path.read_bytes()
+
+
+class SaveProfileTests(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        _write_pdf(self.directory / "input.pdf")
+        self.doc = pymupdf.open(self.directory / "input.pdf")
+        self.addCleanup(self.doc.close)
+
+    def _save(self, profile_name: str) -> Path:
+        target = self.directory / f"{profile_name}.pdf"
+        size = save_document(self.doc, target, profile_name)
+        self.assertEqual(size, target.stat().st_size)
+        with pymupdf.open(target) as saved:
+            self.assertEqual(saved.page_count, 3)
+            self.assertEqual(saved[2].get_text().strip(), "Page 2")
+        return target
+
+    def test_fast(self) -> None:
+        self._save("fast")
+
+    def test_compact(self) -> None:
+        # leaves the objects of the deleted page behind, as the `scale` cropper does with the source pages
+        with pymupdf.open(self.directory / "input.pdf") as source:
+            self.doc.delete_page(0)
+            self.doc.insert_pdf(source, from_page=0, to_page=0, start_at=0)
+        compact = self._save("compact")
+        self.assertLess(compact.stat().st_size, self._save("fast").stat().st_size)
+
+    @unittest.skipIf(shutil.which("qpdf") is None, "qpdf is not installed")
+    def test_linearized(self) -> None:
+        with pymupdf.open(self._save("linearized")) as saved:
+            self.assertTrue(saved.is_fast_webaccess)
+
+    def test_linearized_without_qpdf(self) -> None:
+        message = "The `linearized` save profile requires qpdf"
+        with mock.patch("saving.shutil.which", return_value=None):
+            with self.assertRaisesRegex(RuntimeError, message):
+                check_save_profile("linearized")
+            with self.assertRaisesRegex(RuntimeError, message):
+                save_document(self.doc, self.directory / "linearized.pdf", "linearized")
+            check_save_profile("compact")
+        self.assertFalse((self.directory / "linearized.pdf").exists())
+
+
+class AppendedCopyTests(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.source = self.directory / "input.pdf"
+        self.original = _write_pdf(self.source)
+
+    def _crop(self, doc: pymupdf.Document) -> None:
+        for page in doc:
+            page.set_cropbox(pymupdf.Rect(10, 20, 150, 250))
+
+    def _assert_cropped(self, path: Path) -> None:
+        data = path.read_bytes()
+        # an incremental update keeps the original file as it was
+        self.assertTrue(data.startswith(self.original))
+        self.assertGreater(len(data), len(self.original))
+        with pymupdf.open(path) as doc:
+            for page in doc:
+                self.assertEqual(page.cropbox, pymupdf.Rect(10, 20, 150, 250))
+
+    def test_appends_to_a_separate_output(self) -> None:
+        target = self.directory / "out" / "output.pdf"
+
+        with open_appended_copy(self.source, target) as doc:
+            self._crop(doc)
+
+        self._assert_cropped(target)
+        self.assertEqual(self.source.read_bytes(), self.original)
+        self.assertEqual(sorted(p.name for p in target.parent.iterdir()), ["output.pdf"])
+
+    def test_appends_in_place(self) -> None:
+        with open_appended_copy(self.source, self.source) as doc:
+            self._crop(doc)
+
+        self._assert_cropped(self.source)
+        self.assertEqual([p.name for p in self.directory.iterdir()], ["input.pdf"])
+
+    def test_failed_save_leaves_the_output_as_it_was(self) -> None:
+        target = self.directory / "output.pdf"
+        target.write_bytes(b"previous output")
+
+        with mock.patch("saving._save_appended", side_effect=RuntimeError("disk full")):
+            with self.assertRaises(RuntimeError):
+                with open_appended_copy(self.source, target) as doc:
+                    self._crop(doc)
+
+        self.assertEqual(target.read_bytes(), b"previous output")
+        self.assertEqual(sorted(p.name for p in self.directory.iterdir()), ["input.pdf", "output.pdf"])
+
+    def test_failed_crop_writes_no_output(self) -> None:
+        target = self.directory / "output.pdf"
+
+        with self.assertRaises(ValueError):
+            with open_appended_copy(self.source, target):
+                raise ValueError("no bounds")
+
+        self.assertEqual([p.name for p in self.directory.iterdir()], ["input.pdf"])
+
+    def test_rejects_streams(self) -> None:
+        with self.assertRaises(ValueError):
+            with open_appended_copy(self.source.read_bytes(), self.directory / "output.pdf"):
+                pass
+
+
+class SourceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "input.pdf"
+        self.data = _write_pdf(self.path)
+
+    def _assert_opens(self, source) -> None:
+        with open_document(source) as doc:
+            self.assertEqual(doc.page_count, 3)
+
+    def test_bytes_are_not_copied(self) -> None:
+        self.assertIs(_get_buffer(self.data), self.data)
+        self._assert_opens(self.data)
+
+    def test_bytearray_is_viewed(self) -> None:
+        data = bytearray(self.data)
+        buffer = _get_buffer(data)
+        self.assertIsInstance(buffer, memoryview)
+        self.assertIs(buffer.obj, data)
+        self._assert_opens(data)
+
+    def test_mmap_is_viewed(self) -> None:
+        with open(self.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            buffer = _get_buffer(mapped)
+            self.assertIsInstance(buffer, memoryview)
+            self.assertEqual(bytes(buffer), self.data)
+            buffer.release()
+            self._assert_opens(mapped)
+
+    def test_bytes_io_is_read(self) -> None:
+        self.assertEqual(_get_buffer(io.BytesIO(self.data)), self.data)
+        self._assert_opens(io.BytesIO(self.data))
+
+    def test_regular_file_is_memory_mapped(self) -> None:
+        with open(self.path, "rb") as file:
+            buffer = _get_buffer(file)
+            self.assertIsInstance(buffer, memoryview)
+            self.assertIsInstance(buffer.obj, mmap.mmap)
+            self.assertEqual(bytes(buffer), self.data)
+        with open(self.path, "rb") as file:
+            self._assert_opens(file)
+
+    def _pipe(self) -> io.BufferedReader:
+        read_end, write_end = os.pipe()
+        # small enough to fit into the pipe buffer
+        with os.fdopen(write_end, "wb") as writer:
+            writer.write(self.data)
+        return os.fdopen(read_end, "rb")
+
+    def test_pipe_is_read(self) -> None:
+        with self._pipe() as reader:
+            self.assertEqual(_get_buffer(reader), self.data)
+        with self._pipe() as reader:
+            self._assert_opens(reader)
+
+
+class _Pipe:
+    """A write-only stream that cannot seek, like stdout piped to another process."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self.data += data
+        return len(data)
+
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        raise io.UnsupportedOperation("seek")
+
+    def tell(self) -> int:
+        raise io.UnsupportedOperation("tell")
+
+
+class StreamOutputTests(unittest.TestCase):
+    def test_saves_to_a_stream_that_cannot_seek(self) -> None:
+        pipe = _Pipe()
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "input.pdf"
+            _write_pdf(path)
+            with pymupdf.open(path) as doc:
+                size = save_document(doc, pipe, "fast")
+
+        self.assertEqual(size, len(pipe.data))
+        with pymupdf.open(stream=bytes(pipe.data), filetype="pdf") as saved:
+            self.assertEqual(saved.page_count, 3)
+
+    def test_only_seeks_forwards(self) -> None:
+        output = _StreamOutput(_Pipe())
+        output.write(b"%PDF-1.7")
+
+        self.assertEqual(output.tell(), 8)
+        self.assertEqual(output.seek(8), 8)
+        self.assertEqual(output.seek(0, io.SEEK_CUR), 8)
+        self.assertEqual(output.seek(0, io.SEEK_END), 8)
+        for offset, whence in ((0, io.SEEK_SET), (4, io.SEEK_SET), (-1, io.SEEK_CUR), (-2, io.SEEK_END)):
+            with self.assertRaises(io.UnsupportedOperation):
+                output.seek(offset, whence)
+
+    def test_has_no_name(self) -> None:
+        # PyMuPDF would take a name for the path to save to.
+        self.assertFalse(hasattr(_StreamOutput(_Pipe()), "name"))
+
+
+if __name__ == "__main__":
+    unittest.main()